@@ -1,17 +1,92 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from typing import Optional
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import time
 import httpx
 from app.config import settings
+from app.cache import TTLCache
+from app.http_client import get_http_client
 
 security = HTTPBearer()
 
 
+class _RejectedToken:
+    """Marker stored in the verification cache for tokens the Auth service refused."""
+    __slots__ = ()
+
+
+_REJECTED = _RejectedToken()
+
+# sha256(token) -> user info dict (or _REJECTED)
+_verification_cache = TTLCache(
+    max_entries=settings.AUTH_VERIFY_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_VERIFY_CACHE_TTL
+)
+# sha256(token) -> in-flight upstream verification shared by concurrent callers
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+def _invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _token_cache_ttl(token: str) -> float:
+    """Cache lifetime for a verified token: min(configured TTL, time left until exp)."""
+    ttl = float(settings.AUTH_VERIFY_CACHE_TTL)
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        exp = None
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    return ttl
+
+
+async def _verify_upstream(token: str, key: str) -> dict:
+    """Call the Auth service and record the outcome in the verification cache."""
+    try:
+        response = await get_http_client().post(
+            f"{settings.AUTH_SERVICE_URL}/api/auth/verify",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    except httpx.RequestError:
+        # Outages are not cached so that recovery is picked up immediately
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Auth service unavailable"
+        )
+
+    if response.status_code != 200:
+        _verification_cache.set(key, _REJECTED, ttl=settings.AUTH_VERIFY_FAILURE_TTL)
+        raise _invalid_credentials()
+
+    user_data = response.json()
+    _verification_cache.set(key, user_data, ttl=_token_cache_ttl(token))
+    return user_data
+
+
+def _forget_inflight(key: str, future: "asyncio.Future") -> None:
+    _inflight.pop(key, None)
+    if not future.cancelled():
+        # Mark the exception as retrieved even if every waiter went away
+        future.exception()
+
+
 async def verify_token_with_auth_service(token: str) -> dict:
     """
     Verify token with the Auth service.
     
+    Results are cached per token hash until min(AUTH_VERIFY_CACHE_TTL, token exp);
+    rejections are cached for AUTH_VERIFY_FAILURE_TTL. Concurrent lookups for the
+    same token share a single upstream request.
+    
     Args:
         token: JWT token to verify
         
@@ -21,26 +96,27 @@ async def verify_token_with_auth_service(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or auth service is unreachable
     """
-    try:
-        async with httpx.AsyncClient(timeout=settings.AUTH_SERVICE_TIMEOUT) as client:
-            response = await client.post(
-                f"{settings.AUTH_SERVICE_URL}/api/auth/verify",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication credentials",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-    except httpx.RequestError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Auth service unavailable"
-        )
+    key = hashlib.sha256(token.encode()).hexdigest()
+
+    cached = _verification_cache.get(key)
+    if cached is _REJECTED:
+        raise _invalid_credentials()
+    if cached is not None:
+        return cached
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_verify_upstream(token, key))
+        _inflight[key] = future
+        future.add_done_callback(lambda f: _forget_inflight(key, f))
+
+    # Shield so one cancelled request does not abort the lookup for the others
+    return await asyncio.shield(future)
+
+
+def verification_cache_stats() -> dict:
+    """Counters for the token verification cache."""
+    return {**_verification_cache.stats(), "inflight": len(_inflight)}
 
 
 def decode_token_locally(token: str) -> dict:
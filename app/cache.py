@@ -0,0 +1,329 @@
+"""
+In-process and shared caching primitives.
+
+`TTLCache` is a bounded LRU with per-entry expiry and tag-based invalidation.
+`VendorListingCache` layers it in front of an optional shared backend so that
+vendor listings can be served without touching Postgres.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry TTL and tag-based invalidation."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> None:
+        """Store `value` under `key`, expiring after `ttl` seconds (default: cache TTL)."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Drop a single entry. Returns True if it was present."""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of `tags`. Returns the number removed."""
+        removed = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                if self.delete(key):
+                    removed += 1
+        self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+
+class CacheBackend:
+    """
+    Shared cache tier interface.
+
+    Backends store opaque bytes so that every worker can read what another
+    worker wrote. Implementations must be best-effort: failures are logged by
+    the caller and treated as a miss.
+    """
+
+    name = "base"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    """In-process stand-in for the shared tier (development and tests)."""
+
+    name = "local"
+
+    def __init__(self, max_entries: int = 4096):
+        self._cache = TTLCache(max_entries=max_entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        self._cache.set(key, value, ttl=ttl, tags=tags)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        self._cache.invalidate_tags(tags)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed shared tier. Tags are kept as Redis sets of member keys."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "wedding-core"):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError("VENDOR_CACHE_BACKEND=redis requires the 'redis' package") from exc
+
+        self._redis = aioredis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:cache:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self._prefix}:tag:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self._key(key))
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.set(self._key(key), value, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), self._key(key))
+            pipe.expire(self._tag(tag), ttl)
+        await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tag_keys = [self._tag(tag) for tag in tags]
+        if not tag_keys:
+            return
+        members = set()
+        for tag_key in tag_keys:
+            members.update(await self._redis.smembers(tag_key))
+        await self._redis.delete(*tag_keys, *members)
+
+
+def build_backend(kind: str) -> Optional[CacheBackend]:
+    """Create the shared cache backend configured by `VENDOR_CACHE_BACKEND`."""
+    kind = (kind or "none").lower()
+    if kind == "none":
+        return None
+    if kind == "local":
+        return LocalCacheBackend()
+    if kind == "redis":
+        return RedisCacheBackend(settings.REDIS_URL)
+    raise RuntimeError(f"Unknown VENDOR_CACHE_BACKEND: {kind}")
+
+
+# Tags used for vendor listing invalidation
+ALL_VENDORS_TAG = "vendors:all"
+
+
+def vendor_tag(vendor_id: int) -> str:
+    return f"vendor:{vendor_id}"
+
+
+def category_tag(category_id: int) -> str:
+    return f"category:{category_id}"
+
+
+class VendorListingCache:
+    """
+    Read-through cache for vendor listings.
+
+    Lookups go to the in-process LRU first and then to the optional shared
+    backend. Writers invalidate by tag; the local tier of other workers is
+    bounded by its TTL. Values are serialized response bodies (bytes), so a
+    hit is sent to the client without re-encoding.
+    """
+
+    def __init__(self, local: TTLCache, backend: Optional[CacheBackend] = None, namespace: str = "vendors"):
+        self.local = local
+        self.backend = backend
+        self.namespace = namespace
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    def make_key(self, params: Any) -> str:
+        """Build a stable cache key from query params (pydantic model or dict)."""
+        data = params.model_dump() if hasattr(params, "model_dump") else dict(params or {})
+        return f"{self.namespace}:" + json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if self.backend is None:
+            return None
+
+        try:
+            raw = await self.backend.get(key)
+        except Exception as exc:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache get failed: {exc}")
+            return None
+
+        if raw is None:
+            self.shared_misses += 1
+            return None
+
+        # Shared entries are a JSON tag list, a newline, then the body
+        header, sep, body = raw.partition(b"\n")
+        try:
+            tags = json.loads(header)
+        except ValueError:
+            tags = None
+        if not sep or not isinstance(tags, list):
+            self.shared_misses += 1
+            return None
+
+        self.shared_hits += 1
+        self.local.set(key, body, tags=tags)
+        return body
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str] = ()) -> None:
+        tags = sorted(set(tags))
+        self.local.set(key, value, tags=tags)
+
+        if self.backend is None:
+            return
+
+        try:
+            raw = json.dumps(tags, separators=(",", ":")).encode() + b"\n" + value
+            await self.backend.set(key, raw, ttl=int(self.local.ttl), tags=tags)
+        except Exception as exc:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache set failed: {exc}")
+
+    async def invalidate(self, *tags: str) -> None:
+        self.local.invalidate_tags(tags)
+
+        if self.backend is None:
+            return
+
+        try:
+            await self.backend.invalidate_tags(tags)
+        except Exception as exc:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache invalidation failed: {exc}")
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "shared": {
+                "backend": self.backend.name if self.backend else None,
+                "hits": self.shared_hits,
+                "misses": self.shared_misses,
+                "errors": self.shared_errors,
+            },
+        }
+
+
+vendor_cache = VendorListingCache(
+    local=TTLCache(
+        max_entries=settings.VENDOR_CACHE_MAX_ENTRIES,
+        ttl=settings.VENDOR_CACHE_TTL,
+    ),
+    backend=build_backend(settings.VENDOR_CACHE_BACKEND),
+)
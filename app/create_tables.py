@@ -1,25 +1,39 @@
 """
-Create all database tables (dev utility).
+Reset the database schema and migrate it to head (dev utility).
 
 WARNING: This drops all tables first. Use only in development.
 """
 import asyncio
 
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
 from app.database import engine, Base
+from app.schema_version import ALEMBIC_INI
 
 # Import models so they are registered on Base.metadata
 from app import models  # noqa: F401
 
 
-async def main() -> None:
+async def drop_schema() -> None:
     async with engine.begin() as conn:
         # Dev-only: reset schema
         await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await conn.execute(text("DROP FUNCTION IF EXISTS bump_table_version()"))
+        await conn.execute(text("DROP FUNCTION IF EXISTS mark_table_changed()"))
+        await conn.execute(text("DROP FUNCTION IF EXISTS budget_categories_spent_delta()"))
 
     await engine.dispose()
+
+
+def main() -> None:
+    asyncio.run(drop_schema())
+    # The Alembic env runs its own event loop, so upgrade outside ours
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
     print("✅ Tables created successfully")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
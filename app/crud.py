@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 from app.crud_base import CRUDBase
 from app.models import (
     Budget,
@@ -13,146 +14,142 @@ from app.models import (
 
 class CRUDWeddingCore(CRUDBase[Budget]):
     """CRUD operations for Wedding Core."""
-    
-    def get_by_user(
+
+    async def get_by_user(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Budget]:
-        """Get all weddings for a specific user."""
-        return db.query(Budget).filter(
-            Budget.user_id == user_id
-        ).offset(skip).limit(limit).all()
-    
-    def count_by_user(self, db: Session, user_id: int) -> int:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Tuple[List[Budget], Optional[str]]:
+        """Get a page of weddings for a specific user."""
+        return await self.list(db, {"user_id": user_id}, limit=limit, cursor=cursor, skip=skip)
+
+    async def count_by_user(self, db: AsyncSession, user_id: int) -> int:
         """Count weddings for a specific user."""
-        return db.query(Budget).filter(
-            Budget.user_id == user_id
-        ).count()
-    
-    def create_for_user(
+        return await self.count(db, {"user_id": user_id})
+
+    async def create_for_user(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: int,
         obj_in: dict
     ) -> Budget:
         """Create a wedding for a specific user."""
         obj_in["user_id"] = user_id
-        return self.create(db, obj_in)
+        return await self.create(db, obj_in)
 
 
 class CRUDBudgetCategory(CRUDBase[BudgetCategory]):
     """CRUD operations for Budget Category."""
-    
-    def get_by_wedding(
+
+    async def get_by_budget(
         self,
-        db: Session,
-        wedding_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[BudgetCategory]:
-        """Get all budget categories for a specific wedding."""
-        return db.query(BudgetCategory).filter(
-            BudgetCategory.wedding_id == wedding_id
-        ).offset(skip).limit(limit).all()
-    
-    def count_by_wedding(self, db: Session, wedding_id: int) -> int:
-        """Count budget categories for a specific wedding."""
-        return db.query(BudgetCategory).filter(
-            BudgetCategory.wedding_id == wedding_id
-        ).count()
+        db: AsyncSession,
+        budget_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[BudgetCategory], Optional[str]]:
+        """Get a page of categories for a specific budget (wedding)."""
+        return await self.list(db, {"budget_id": budget_id}, limit=limit, cursor=cursor)
+
+    async def count_by_budget(self, db: AsyncSession, budget_id: int) -> int:
+        """Count categories for a specific budget (wedding)."""
+        return await self.count(db, {"budget_id": budget_id})
 
 
 class CRUDServiceCategory(CRUDBase[ServiceCategory]):
     """CRUD operations for Service Category."""
-    
-    def get_by_name(self, db: Session, name: str) -> Optional[ServiceCategory]:
+
+    async def get_by_name(self, db: AsyncSession, name: str) -> Optional[ServiceCategory]:
         """Get service category by name."""
-        return db.query(ServiceCategory).filter(
-            ServiceCategory.name == name
-        ).first()
+        result = await db.execute(
+            select(ServiceCategory).where(ServiceCategory.name == name).limit(1)
+        )
+        return result.scalar_one_or_none()
 
 
 class CRUDVendor(CRUDBase[Vendor]):
     """CRUD operations for Vendor."""
-    
-    def get_by_service_category(
+
+    async def get_by_service_category(
         self,
-        db: Session,
+        db: AsyncSession,
         service_category_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Vendor]:
-        """Get all vendors for a specific service category."""
-        return db.query(Vendor).filter(
-            Vendor.service_categories == service_category_id
-        ).offset(skip).limit(limit).all()
-    
-    def search_by_name(
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Vendor], Optional[str]]:
+        """Get a page of vendors for a specific service category."""
+        return await self.list(
+            db,
+            {"service_category_id": service_category_id},
+            limit=limit,
+            cursor=cursor
+        )
+
+    async def search_by_name(
         self,
-        db: Session,
+        db: AsyncSession,
         name: str,
         skip: int = 0,
         limit: int = 100
     ) -> List[Vendor]:
-        """Search vendors by name."""
-        return db.query(Vendor).filter(
-            Vendor.name.ilike(f"%{name}%")
-        ).offset(skip).limit(limit).all()
+        """Search vendors by name, ranked by trigram similarity."""
+        result = await db.execute(
+            select(Vendor).where(
+                Vendor.name.op("%")(name)
+            ).order_by(
+                func.similarity(Vendor.name, name).desc(), Vendor.id
+            ).offset(skip).limit(limit)
+        )
+        return list(result.scalars())
 
 
 class CRUDVendorMedia(CRUDBase[VendorMedia]):
     """CRUD operations for Vendor Media."""
-    
-    def get_by_vendor(
+
+    async def get_by_vendor(
         self,
-        db: Session,
+        db: AsyncSession,
         vendor_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[VendorMedia]:
-        """Get all media for a specific vendor."""
-        return db.query(VendorMedia).filter(
-            VendorMedia.vendor_id == vendor_id
-        ).offset(skip).limit(limit).all()
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[VendorMedia], Optional[str]]:
+        """Get a page of live (not deleted) media for a specific vendor."""
+        return await self.list(
+            db,
+            {"vendor_id": vendor_id},
+            VendorMedia.deleted_at.is_(None),
+            limit=limit,
+            cursor=cursor
+        )
 
 
 class CRUDBudgetVendorMap(CRUDBase[BudgetVendorMap]):
     """CRUD operations for Budget Vendor Map."""
-    
-    def get_by_wedding(
-        self,
-        db: Session,
-        wedding_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[BudgetVendorMap]:
-        """Get all budget-vendor mappings for a specific wedding."""
-        return db.query(BudgetVendorMap).filter(
-            BudgetVendorMap.wedding_id == wedding_id
-        ).offset(skip).limit(limit).all()
-    
-    def get_by_budget(
+
+    async def get_by_budget(
         self,
-        db: Session,
+        db: AsyncSession,
         budget_id: int
     ) -> List[BudgetVendorMap]:
-        """Get all vendors mapped to a specific budget."""
-        return db.query(BudgetVendorMap).filter(
-            BudgetVendorMap.budget_id == budget_id
-        ).all()
-    
-    def get_by_vendor(
+        """Get all vendors mapped to a specific budget (wedding)."""
+        result = await db.execute(
+            select(BudgetVendorMap).where(BudgetVendorMap.budget_id == budget_id)
+        )
+        return list(result.scalars())
+
+    async def get_by_vendor(
         self,
-        db: Session,
+        db: AsyncSession,
         vendor_id: int
     ) -> List[BudgetVendorMap]:
         """Get all budgets mapped to a specific vendor."""
-        return db.query(BudgetVendorMap).filter(
-            BudgetVendorMap.vendor_id == vendor_id
-        ).all()
+        result = await db.execute(
+            select(BudgetVendorMap).where(BudgetVendorMap.vendor_id == vendor_id)
+        )
+        return list(result.scalars())
 
 
 # Create CRUD instances
@@ -161,4 +158,4 @@ budget_category_crud = CRUDBudgetCategory(BudgetCategory)
 service_category_crud = CRUDServiceCategory(ServiceCategory)
 vendor_crud = CRUDVendor(Vendor)
 vendor_media_crud = CRUDVendorMedia(VendorMedia)
-budget_vendor_map_crud = CRUDBudgetVendorMap(BudgetVendorMap)
\ No newline at end of file
+budget_vendor_map_crud = CRUDBudgetVendorMap(BudgetVendorMap)
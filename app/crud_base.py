@@ -1,141 +1,226 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Type, TypeVar, Generic
-from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
 from app.database import Base
+from app.pagination import encode_cursor, decode_cursor, keyset_condition
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
 class CRUDBase(Generic[ModelType]):
-    """Base class for CRUD operations."""
-    
+    """
+    Async repository base.
+
+    Every method issues exactly one statement. Nothing here commits: callers
+    own the transaction and commit once per unit of work.
+    """
+
     def __init__(self, model: Type[ModelType]):
         """
         Initialize CRUD object with a SQLAlchemy model.
-        
+
         Args:
             model: SQLAlchemy model class
         """
         self.model = model
-    
-    def get(self, db: Session, id: int) -> Optional[ModelType]:
+
+    def _conditions(self, filters: Optional[Dict[str, Any]], where: Iterable[Any] = ()) -> List[Any]:
+        """Equality conditions for known, non-None filter values plus raw clauses."""
+        conditions = list(where)
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key) and value is not None:
+                    conditions.append(getattr(self.model, key) == value)
+        return conditions
+
+    async def get(self, db: AsyncSession, id: int, *where: Any) -> Optional[ModelType]:
         """
         Get a single record by ID.
-        
+
         Args:
             db: Database session
             id: Record ID
-            
+            where: Extra conditions (e.g. ownership) the row must satisfy
+
         Returns:
             Model instance or None
         """
-        return db.query(self.model).filter(self.model.id == id).first()
-    
-    def get_multi(
+        stmt = select(self.model).where(self.model.id == id, *where)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[int], *where: Any) -> List[ModelType]:
+        """
+        Get several records by ID with a single IN query.
+
+        Args:
+            db: Database session
+            ids: Record IDs; duplicates are ignored
+            where: Extra conditions the rows must satisfy
+
+        Returns:
+            Model instances in the order of `ids`, skipping missing ones
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return []
+
+        stmt = select(self.model).where(self.model.id.in_(unique_ids), *where)
+        result = await db.execute(stmt)
+        by_id = {obj.id: obj for obj in result.scalars()}
+        return [by_id[id] for id in unique_ids if id in by_id]
+
+    async def list(
         self,
-        db: Session,
-        skip: int = 0,
+        db: AsyncSession,
+        filters: Dict[str, Any] = None,
+        *where: Any,
         limit: int = 100,
-        filters: dict = None
-    ) -> List[ModelType]:
+        cursor: Optional[str] = None,
+        order: str = "asc",
+        skip: int = 0
+    ) -> Tuple[List[ModelType], Optional[str]]:
         """
-        Get multiple records with pagination and filters.
-        
+        List records by ID with keyset pagination.
+
         Args:
             db: Database session
-            skip: Number of records to skip
+            filters: Dictionary of equality filter conditions
+            where: Extra conditions the rows must satisfy
             limit: Maximum number of records to return
-            filters: Dictionary of filter conditions
-            
+            cursor: Cursor returned by the previous page
+            order: "asc" or "desc" by ID
+            skip: Legacy offset, only used when no cursor is given
+
         Returns:
-            List of model instances
+            (model instances, cursor for the next page or None)
         """
-        query = db.query(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key) and value is not None:
-                    query = query.filter(getattr(self.model, key) == value)
-        
-        return query.offset(skip).limit(limit).all()
-    
-    def count(self, db: Session, filters: dict = None) -> int:
+        descending = order == "desc"
+        conditions = self._conditions(filters, where)
+        if cursor:
+            state = decode_cursor(cursor, "id", order)
+            conditions.append(keyset_condition(self.model.id, self.model.id, None, state["id"], descending))
+
+        stmt = (
+            select(self.model)
+            .where(*conditions)
+            .order_by(self.model.id.desc() if descending else self.model.id.asc())
+            # One extra row tells us whether another page exists
+            .limit(limit + 1)
+        )
+        if skip and not cursor:
+            stmt = stmt.offset(skip)
+        result = await db.execute(stmt)
+        items = list(result.scalars())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor("id", order, None, items[-1].id)
+        return items, next_cursor
+
+    async def count(self, db: AsyncSession, filters: Dict[str, Any] = None, *where: Any) -> int:
         """
         Count records with optional filters.
-        
+
         Args:
             db: Database session
             filters: Dictionary of filter conditions
-            
+            where: Extra conditions the rows must satisfy
+
         Returns:
             Count of records
         """
-        query = db.query(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key) and value is not None:
-                    query = query.filter(getattr(self.model, key) == value)
-        
-        return query.count()
-    
-    def create(self, db: Session, obj_in: dict) -> ModelType:
-        """
-        Create a new record.
-        
+        stmt = select(func.count()).select_from(self.model).where(*self._conditions(filters, where))
+        result = await db.execute(stmt)
+        return result.scalar_one()
+
+    async def create(self, db: AsyncSession, obj_in: Dict[str, Any]) -> ModelType:
+        """
+        Create a new record with INSERT ... RETURNING.
+
         Args:
             db: Database session
             obj_in: Dictionary of object attributes
-            
+
         Returns:
             Created model instance
         """
-        db_obj = self.model(**obj_in)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-    
-    def update(
+        result = await db.execute(insert(self.model).values(**obj_in).returning(self.model))
+        return result.scalar_one()
+
+    async def bulk_create(self, db: AsyncSession, objs_in: Sequence[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Create several records with one multi-row INSERT ... RETURNING.
+
+        Args:
+            db: Database session
+            objs_in: Dictionaries of object attributes (same keys in each)
+
+        Returns:
+            Created model instances in input order
+        """
+        if not objs_in:
+            return []
+
+        result = await db.execute(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            list(objs_in)
+        )
+        return list(result.scalars())
+
+    async def update(
         self,
-        db: Session,
-        db_obj: ModelType,
-        obj_in: dict
-    ) -> ModelType:
+        db: AsyncSession,
+        id: int,
+        obj_in: Dict[str, Any],
+        *where: Any
+    ) -> Optional[ModelType]:
         """
-        Update an existing record.
-        
+        Update a record with UPDATE ... RETURNING.
+
+        None values are skipped, matching the partial-update schemas.
+
         Args:
             db: Database session
-            db_obj: Existing model instance
+            id: Record ID
             obj_in: Dictionary of updated attributes
-            
+            where: Extra conditions (e.g. ownership) the row must satisfy
+
         Returns:
-            Updated model instance
-        """
-        for field, value in obj_in.items():
-            if value is not None and hasattr(db_obj, field):
-                setattr(db_obj, field, value)
-        
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-    
-    def delete(self, db: Session, id: int) -> bool:
+            Updated model instance, or None if no row matched
+        """
+        values = {
+            field: value for field, value in obj_in.items()
+            if value is not None and hasattr(self.model, field)
+        }
+        if not values:
+            return await self.get(db, id, *where)
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id, *where)
+            .values(**values)
+            .returning(*self.model.__table__.c)
+        )
+        # Load through from_statement so an instance already in the session is
+        # refreshed with the returned row, including onupdate columns
+        orm_stmt = select(self.model).from_statement(stmt).execution_options(populate_existing=True)
+        result = await db.execute(orm_stmt)
+        return result.scalar_one_or_none()
+
+    async def delete(self, db: AsyncSession, id: int, *where: Any) -> bool:
         """
         Delete a record by ID.
-        
+
         Args:
             db: Database session
             id: Record ID
-            
+            where: Extra conditions (e.g. ownership) the row must satisfy
+
         Returns:
             True if deleted, False if not found
         """
-        obj = db.query(self.model).filter(self.model.id == id).first()
-        if obj:
-            db.delete(obj)
-            db.commit()
-            return True
-        return False
\ No newline at end of file
+        stmt = delete(self.model).where(self.model.id == id, *where).returning(self.model.id)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none() is not None
@@ -1,18 +1,106 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+"""
+Database engine registry.
+
+Every part of the service shares the engines registered here, so a worker
+opens at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections per database.
+Pools are instrumented: checkout waits feed a histogram and the in-use /
+overflow gauges are read from the pool when stats are requested.
+"""
+import time
+from typing import Dict
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.metrics import Histogram
 
-# Create async database engine
-# Convert postgresql:// to postgresql+asyncpg://
-database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+PRIMARY = "primary"
 
-engine = create_async_engine(
-    database_url,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited (including any connect)."""
+
+    def __init__(self, *args, checkout_wait: Histogram = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = checkout_wait if checkout_wait is not None else Histogram()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the accumulated histogram
+        pool = super().recreate()
+        pool.checkout_wait = self.checkout_wait
+        return pool
+
+
+def async_url(url: str) -> str:
+    # Convert postgresql:// to postgresql+asyncpg://
+    return url.replace("postgresql://", "postgresql+asyncpg://")
+
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    """Build an async engine with the pool and asyncpg options from settings."""
+    return create_async_engine(
+        async_url(url),
+        echo=settings.DEBUG,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={
+            # asyncpg's own statement cache and SQLAlchemy's prepared statement
+            # cache; set both to 0 behind PgBouncer in transaction mode
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+engines: Dict[str, AsyncEngine] = {}
+
+
+def register_engine(name: str, url: str) -> AsyncEngine:
+    """Create (once) and return the engine registered under `name`."""
+    if name not in engines:
+        engines[name] = create_engine_from_settings(url)
+    return engines[name]
+
+
+def get_engine(name: str = PRIMARY) -> AsyncEngine:
+    return engines[name]
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (called from the application lifespan)."""
+    for registered in engines.values():
+        await registered.dispose()
+
+
+def pool_stats(name: str = PRIMARY) -> dict:
+    """Gauges and checkout-wait histogram for one engine's pool."""
+    pool = get_engine(name).pool
+    capacity = pool.size() + pool._max_overflow
+    in_use = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "in_use": in_use,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+        "checkout_wait_seconds": pool.checkout_wait.snapshot(),
+    }
+
+
+engine = register_engine(PRIMARY, settings.DATABASE_URL)
 
 # Create async SessionLocal class
 AsyncSessionLocal = async_sessionmaker(
@@ -36,4 +124,4 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -1,39 +1,13 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
-from app.config import settings
+"""
+Backwards-compatible alias for app.database.
 
-# Create async database engine
-# Note: Use postgresql+asyncpg:// instead of postgresql://
-DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+This module used to build a second engine with its own pool; everything now
+shares the registry in app.database.
+"""
+from app.database import engine, AsyncSessionLocal, Base, get_db
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+DATABASE_URL = engine.url.render_as_string(hide_password=False)
 
-# Create AsyncSessionLocal class
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False
-)
+get_async_db = get_db
 
-# Create Base class for declarative models
-Base = declarative_base()
-
-
-async def get_async_db():
-    """
-    Dependency function to get async database session.
-    Yields a database session and closes it after use.
-    """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+__all__ = ["engine", "AsyncSessionLocal", "Base", "get_async_db", "DATABASE_URL"]
@@ -0,0 +1,68 @@
+"""
+Conditional GET support for read-mostly listings.
+
+ETags are weak validators derived from per-table change counters
+(`table_versions`, bumped at commit by transactions that changed visible
+rows) plus the request variant (query params), so computing one is a single
+primary-key lookup instead of scanning the data. A matching `If-None-Match`
+short-circuits to 304 before the listing query runs or anything is
+serialized.
+
+Read the version *before* the data: a write landing between the two then
+yields an old tag on new data (the next request simply gets a 200), never a
+new tag on stale data that clients would keep revalidating against.
+"""
+import hashlib
+from typing import Any, Dict, Sequence
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TableVersion
+
+SERVICE_CATEGORY_TABLES = ("service_categories",)
+VENDOR_LISTING_TABLES = ("vendors", "vendor_media", "service_categories")
+
+
+async def table_versions(db: AsyncSession, tables: Sequence[str]) -> str:
+    """Current change counters of `tables` as one opaque token, e.g. "12.40.3"."""
+    result = await db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    )
+    versions = dict(result.all())
+    return ".".join(str(versions.get(table, 0)) for table in tables)
+
+
+def make_etag(version: str, *variant: Any) -> str:
+    """Weak ETag for one representation: table versions + whatever selects the variant."""
+    raw = "|".join([version, *map(str, variant)])
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match list."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str, cache_control: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 carrying the validator and caching policy (RFC 9110 15.4.5)."""
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
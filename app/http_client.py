@@ -0,0 +1,107 @@
+"""
+Application-scoped httpx client for calls to the Auth service.
+
+The client is created and closed in the FastAPI lifespan so that every
+request reuses pooled keep-alive connections instead of paying a fresh
+TCP/TLS handshake.
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_requests_sent = 0
+
+
+async def _count_request(request: httpx.Request) -> None:
+    global _requests_sent
+    _requests_sent += 1
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = settings.AUTH_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("AUTH_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=settings.AUTH_SERVICE_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.AUTH_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AUTH_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.AUTH_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+        event_hooks={"request": [_count_request]},
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the application lifespan)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+        logger.info("Shared auth-service HTTP client started")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Shared auth-service HTTP client closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client.
+
+    Falls back to creating it lazily so that code running outside the
+    application lifespan (scripts, one-off tasks) keeps working.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def pool_stats() -> dict:
+    """Connection pool statistics for sizing AUTH_HTTP_* limits."""
+    stats = {
+        "started": _client is not None and not _client.is_closed,
+        "http2": bool(settings.AUTH_HTTP2 and _http2_available()),
+        "max_connections": settings.AUTH_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.AUTH_HTTP_MAX_KEEPALIVE,
+        "requests_sent": _requests_sent,
+        "connections": 0,
+        "active": 0,
+        "idle": 0,
+        "queued_requests": 0,
+    }
+    if not stats["started"]:
+        return stats
+
+    # httpcore does not expose a public stats API; read the pool defensively
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for conn in connections if conn.is_idle())
+    stats["connections"] = len(connections)
+    stats["idle"] = idle
+    stats["active"] = len(connections) - idle
+    stats["queued_requests"] = len(getattr(pool, "_requests", []) or [])
+    return stats
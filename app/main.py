@@ -1,8 +1,16 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, dispose_engines, pool_stats as db_pool_stats
+from app.schema_version import check_schema_version
+from app.cache import vendor_cache
+from app.auth import verification_cache_stats
+from app.http_client import start_http_client, close_http_client, pool_stats
+from app.replicas import replica_router, read_your_writes_middleware
+from app.service_managers.media_deletion_worker import media_deletion_worker
+from app.service_managers.service_categories_manager import ServiceCategoriesManagerAsync
 from app.routers import (
     budget,
     weddings,
@@ -20,12 +28,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    # Migrations run out of band (`alembic upgrade head`); only verify the revision here
+    if settings.SCHEMA_VERSION_CHECK:
+        await check_schema_version(engine)
+
+    await start_http_client()
+    await replica_router.start()
+    await ServiceCategoriesManagerAsync.start_refresher()
+    if settings.MEDIA_DELETE_WORKER_ENABLED:
+        media_deletion_worker.start()
+    try:
+        yield
+    finally:
+        await media_deletion_worker.stop()
+        await ServiceCategoriesManagerAsync.stop_refresher()
+        await replica_router.stop()
+        await close_http_client()
+        await dispose_engines()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Wedding Core Service",
     description="Microservice for managing wedding planning and vendors",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -37,18 +70,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-
-# Create database tables
-@app.on_event("startup")
-async def startup_event():
-    """Create database tables on startup."""
-    logger.info("Creating database tables...")
-
-    # engine is AsyncEngine, so DDL must be executed via run_sync
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    logger.info("Database tables created successfully!")
+# Pin clients that just wrote to the primary (no-op without replicas)
+app.middleware("http")(read_your_writes_middleware)
 
 
 # Health check endpoint
@@ -62,6 +85,51 @@ async def health_check():
     }
 
 
+@app.get("/health/cache", tags=["health"])
+async def cache_stats():
+    """Hit/miss/eviction counters for the in-process caches."""
+    return {
+        "vendors": vendor_cache.stats(),
+        "auth_verification": verification_cache_stats(),
+        "service_categories": ServiceCategoriesManagerAsync.stats(),
+    }
+
+
+@app.get("/health/ready", tags=["health"])
+async def readiness_check():
+    """Readiness probe; fails while the database pool is saturated."""
+    pool = db_pool_stats()
+    ready = pool["saturation"] < settings.DB_READY_MAX_SATURATION
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "saturated", "database_pool": pool}
+    )
+
+
+@app.get("/health/db-pool", tags=["health"])
+async def db_pool():
+    """Database pool gauges and checkout-wait histogram."""
+    return db_pool_stats()
+
+
+@app.get("/health/replicas", tags=["health"])
+async def replica_stats():
+    """Replica lag, rotation state and read routing counters."""
+    return replica_router.stats()
+
+
+@app.get("/health/media-deletion", tags=["health"])
+async def media_deletion_stats():
+    """Deleted-media purge backlog, including objects that ran out of delete attempts."""
+    return await media_deletion_worker.stats()
+
+
+@app.get("/health/http-pool", tags=["health"])
+async def http_pool_stats():
+    """Connection pool statistics for the shared Auth service client."""
+    return pool_stats()
+
+
 # Root endpoint
 @app.get("/", tags=["root"])
 async def root():
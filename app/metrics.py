@@ -0,0 +1,61 @@
+"""
+Minimal in-process metrics.
+
+Counters and gauges are read straight from the objects they describe (cache
+stats, pool status); this module only provides the cumulative histogram
+used for latency distributions, exposed through the /health endpoints.
+"""
+import bisect
+import threading
+from typing import Dict, Sequence
+
+# Seconds; tuned for pool checkout waits (sub-millisecond when the pool is healthy)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative bucketed histogram (Prometheus-style `le` buckets)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        # Pool checkouts can happen from threads (sync engines, run_sync)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum = self.count, self.sum, self.max
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "max": round(maximum, 6),
+            "avg": round(total / count, 6) if count else 0.0,
+            "buckets": cumulative,
+        }
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Numeric, JSON
+from sqlalchemy import BigInteger, Column, Computed, Integer, String, DateTime, Boolean, ForeignKey, Text, Numeric, JSON, Index, DDL, event, func
+from sqlalchemy.dialects.postgresql import INT4RANGE
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -39,7 +40,8 @@ class BudgetCategory(Base):
     budget_cat = Column(Integer)
     budget_amt = Column(Integer)
     actual_cost = Column(Integer)
-    remaining = Column(Integer)
+    # Server-derived (migration 0004); never written by the application
+    remaining = Column(Integer, Computed("COALESCE(budget_amt, 0) - COALESCE(actual_cost, 0)", persisted=True))
     meta = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -52,13 +54,18 @@ class BudgetCategory(Base):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # Target of the ON CONFLICT (budget_id, budget_cat) category upsert
+        Index("uq_budget_categories_budget_cat", "budget_id", "budget_cat", unique=True),
+    )
+
 
 class ServiceCategory(Base):
     """Service categories available."""
     __tablename__ = "service_categories"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
     short_desc = Column(String, nullable=False)
     description = Column(String, nullable=False)
     percentage = Column(Integer)
@@ -78,13 +85,20 @@ class Vendor(Base):
     name = Column(String(255), nullable=False)
     phone1 = Column(String(20))
     phone2 = Column(String(20))
-    username = Column(String)
+    username = Column(String, index=True)
     city = Column(String)
     district = Column(String)
     address = Column(String(500))
     email = Column(String(255), nullable=True)
     lower_range = Column(Integer)
     upper_range = Column(Integer)
+    # Closed price band for overlap matching; NULL when no price is listed
+    price_range = Column(INT4RANGE, Computed(
+        "CASE WHEN lower_range IS NULL AND upper_range IS NULL THEN NULL "
+        "WHEN lower_range > upper_range THEN int4range(upper_range, lower_range, '[]') "
+        "ELSE int4range(lower_range, upper_range, '[]') END",
+        persisted=True,
+    ))
     meta = Column(JSON)
     is_active = Column(Boolean, default=True)
     service_category_id = Column(Integer, ForeignKey("service_categories.id"), index=True)
@@ -96,6 +110,44 @@ class Vendor(Base):
     vendor_media = relationship("VendorMedia", back_populates="vendor", cascade="all, delete-orphan")
     budget_vendor_maps = relationship("BudgetVendorMap", back_populates="vendor", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination indexes, one per supported sort key
+        Index("ix_vendors_active_id", "is_active", "id"),
+        Index("ix_vendors_active_created_at", "is_active", "created_at", "id"),
+        Index("ix_vendors_active_lower_range", "is_active", "lower_range", "id"),
+        Index("ix_vendors_active_upper_range", "is_active", "upper_range", "id"),
+        # Trigram indexes for fuzzy search and ILIKE '%term%'
+        Index("ix_vendors_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_vendors_city_trgm", "city", postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}),
+        Index("ix_vendors_district_trgm", "district", postgresql_using="gin", postgresql_ops={"district": "gin_trgm_ops"}),
+        # Discovery filters, and a narrow covering index so facet counts are index-only scans
+        Index("ix_vendors_active_lower_city", func.lower(city), postgresql_where=is_active),
+        Index("ix_vendors_active_lower_district", func.lower(district), postgresql_where=is_active),
+        Index("ix_vendors_active_facets", service_category_id, city, district, lower_range, postgresql_where=is_active),
+        # Budget matching: category and city equality plus price overlap in one GiST scan (btree_gist)
+        Index(
+            "ix_vendors_active_category_city_price",
+            service_category_id,
+            func.lower(city),
+            price_range,
+            postgresql_using="gist",
+            postgresql_where=is_active,
+        ),
+    )
+
+
+# The trigram and btree_gist indexes need their extensions before the vendors table is created
+event.listen(
+    Vendor.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+event.listen(
+    Vendor.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
+
 
 class VendorMedia(Base):
     """Media associated with vendors."""
@@ -106,12 +158,26 @@ class VendorMedia(Base):
     media_type = Column(String(50))
     meta = Column(JSON)
     url = Column(Text)
+    s3_key = Column(String(1024), index=True)
+    # Tombstone: set when the media is deleted, row is purged once S3 delete succeeds
+    deleted_at = Column(DateTime, nullable=True)
+    delete_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # Earliest retry after a failed S3 delete; NULL means due now
+    next_delete_attempt_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     vendor = relationship("Vendor", back_populates="vendor_media")
 
+    __table_args__ = (
+        Index(
+            "ix_vendor_media_pending_delete",
+            "deleted_at",
+            postgresql_where=deleted_at.isnot(None),
+        ),
+    )
+
 
 class BudgetVendorMap(Base):
     """Mapping between budgets and vendors."""
@@ -145,3 +211,32 @@ class BudgetVendorMap(Base):
     budget_category = relationship("BudgetCategory", back_populates="budget_vendor_maps")
     vendor = relationship("Vendor", back_populates="budget_vendor_maps")
     budget = relationship("Budget", back_populates="budget_vendor_maps")
+
+
+class TableVersion(Base):
+    """
+    Change counter per table, bumped at commit by transactions that changed
+    rows visible to listings.
+
+    The triggers are created by migrations 0003 and 0007; listing ETags are
+    derived from these versions.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+
+
+class TableVersionPending(Base):
+    """
+    Tables changed by open transactions, one row per (transaction, table).
+
+    Written by the statement-level triggers and consumed at commit by a
+    deferred trigger that bumps `table_versions` (migration 0007).
+    """
+    __tablename__ = "table_version_pending"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    txid = Column(BigInteger, primary_key=True, server_default=func.txid_current())
+    table_name = Column(String(63), primary_key=True)
@@ -0,0 +1,31 @@
+"""
+Recompute budget.spent_budget for every budget from its categories.
+
+The triggers from migration 0004 keep the totals in step as categories
+change; run this after bulk loads, restores, manual SQL or a TRUNCATE that
+bypassed them.
+
+Usage:
+    python -m app.reconcile_budgets
+"""
+import asyncio
+
+from app.database import AsyncSessionLocal, engine
+from app.service_managers.budget_manager import BudgetManager
+
+
+async def reconcile() -> int:
+    async with AsyncSessionLocal() as db:
+        corrected = await BudgetManager.reconcile_spent_budgets(db)
+
+    await engine.dispose()
+    return corrected
+
+
+def main() -> None:
+    corrected = asyncio.run(reconcile())
+    print(f"✅ Budgets reconciled ({corrected} corrected)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Read-replica routing for read-only endpoints.
+
+Routes that only read depend on `get_read_db` instead of `get_db`. Each
+request gets a session on a healthy replica, chosen round-robin or by fewest
+checked-out connections. A background monitor takes replicas whose replay
+lag exceeds DB_REPLICA_MAX_LAG, or whose WAL receiver is not streaming, out
+of rotation, and clients that wrote recently are pinned to the primary so
+they always read their own writes.
+Without DB_REPLICA_URLS every read goes to the primary as before.
+"""
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import TTLCache
+from app.config import settings
+from app.database import AsyncSessionLocal, engine, register_engine
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Cookie carrying the read-your-writes deadline, so stickiness also holds
+# when the next request lands on a different worker
+STICKY_COOKIE = "db_primary_until"
+
+# The primary's WAL position, read once per check cycle
+PRIMARY_LSN_QUERY = text("SELECT pg_current_wal_lsn()::text")
+
+# Replication state as seen from a replica. pg_stat_wal_receiver has a row
+# only while a WAL receiver runs; its status is NULL for roles without
+# pg_read_all_stats. replay_behind is bytes of the primary's WAL (as of
+# :primary_lsn) not yet replayed, NULL if the primary could not be read.
+REPLICA_STATE_QUERY = text(
+    "SELECT pg_is_in_recovery() AS standby, "
+    "EXISTS (SELECT 1 FROM pg_stat_wal_receiver) AS has_receiver, "
+    "(SELECT status FROM pg_stat_wal_receiver LIMIT 1) AS receiver_status, "
+    "COALESCE(pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), false) AS replayed_received, "
+    "pg_wal_lsn_diff(CAST(CAST(:primary_lsn AS text) AS pg_lsn), pg_last_wal_replay_lsn()) AS replay_behind, "
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age"
+)
+
+
+def replica_lag(state, primary_known: bool) -> tuple:
+    """
+    (lag seconds or None, reason) for one REPLICA_STATE_QUERY row; None means unhealthy.
+
+    A standby without a streaming WAL receiver is unhealthy whatever its
+    replay position says: once the receiver drops, the receive LSN stops
+    and replay catches up to it, so "received == replayed" would read as
+    zero lag while the replica falls further behind. Zero lag means replay
+    has reached the primary's current LSN (or, when the primary can't be
+    read, received == replayed on a streaming receiver); otherwise the lag
+    is the age of the last replayed transaction.
+    """
+    if not state.standby:
+        return 0.0, "primary"
+    if not state.has_receiver:
+        return None, "no WAL receiver"
+    if state.receiver_status is not None and state.receiver_status != "streaming":
+        return None, f"WAL receiver {state.receiver_status}"
+
+    if primary_known:
+        caught_up = state.replay_behind <= 0
+    else:
+        caught_up = state.receiver_status == "streaming" and state.replayed_received
+    if caught_up:
+        return 0.0, "streaming"
+    if state.replay_age is None:
+        return None, "nothing replayed yet"
+    return float(state.replay_age), "streaming"
+
+
+class Replica:
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = register_engine(name, url)
+        self.sessionmaker = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False
+        )
+        # Out of rotation until the first lag check succeeds
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.lag_bytes: Optional[int] = None
+        self.state: Optional[str] = None
+        self.sessions = 0
+
+    def in_use(self) -> int:
+        return self.engine.pool.checkedout()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "lag_bytes": self.lag_bytes,
+            "state": self.state,
+            "in_use": self.in_use(),
+            "sessions": self.sessions,
+        }
+
+
+class ReplicaRouter:
+
+    def __init__(
+        self,
+        urls: List[str],
+        strategy: str,
+        max_lag: float,
+        check_interval: float,
+        sticky_window: float,
+        sticky_max_entries: int
+    ):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls, start=1)]
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_window = sticky_window
+        self._recent_writers = TTLCache(max_entries=sticky_max_entries, ttl=sticky_window)
+        self._round_robin = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """Choose a healthy replica, or None to fall back to the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(healthy, key=Replica.in_use)
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    # Read-your-writes
+
+    @staticmethod
+    def writer_key(request: Request) -> Optional[str]:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header:
+            return None
+        return hashlib.sha256(auth_header.encode()).hexdigest()
+
+    def mark_write(self, key: Optional[str]) -> None:
+        if key:
+            self._recent_writers.set(key, True)
+
+    def is_sticky(self, request: Request, key: Optional[str]) -> bool:
+        if key and self._recent_writers.get(key):
+            return True
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    # Lag monitor
+
+    async def primary_lsn(self) -> Optional[str]:
+        """The primary's current WAL LSN, or None if it can't be read this cycle."""
+        try:
+            async with engine.connect() as conn:
+                return await asyncio.wait_for(conn.scalar(PRIMARY_LSN_QUERY), timeout=self.check_interval)
+        except Exception as e:
+            logger.warning(f"Primary WAL position unavailable for replica lag checks: {e}")
+            return None
+
+    async def check_lag(self, replica: Replica, primary_lsn: Optional[str] = None) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.execute(REPLICA_STATE_QUERY, {"primary_lsn": primary_lsn}),
+                    timeout=self.check_interval
+                )
+                state = result.one()
+            replica.lag, replica.state = replica_lag(state, primary_lsn is not None)
+            replica.lag_bytes = max(int(state.replay_behind), 0) if state.standby and state.replay_behind is not None else None
+            healthy = replica.lag is not None and replica.lag <= self.max_lag
+        except Exception as e:
+            logger.warning(f"Replica {replica.name} lag check failed: {e}")
+            replica.lag = None
+            replica.lag_bytes = None
+            replica.state = "check failed"
+            healthy = False
+
+        if healthy != replica.healthy:
+            logger.info(
+                f"Replica {replica.name} {'back in' if healthy else 'out of'} rotation "
+                f"(lag={replica.lag}, lag_bytes={replica.lag_bytes}, state={replica.state})"
+            )
+        replica.healthy = healthy
+
+    async def check_all(self) -> None:
+        primary_lsn = await self.primary_lsn()
+        await asyncio.gather(*(self.check_lag(replica, primary_lsn) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def start(self) -> None:
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        # Check once before serving so healthy replicas take traffic immediately
+        await self.check_all()
+        self._task = asyncio.create_task(self._run(), name="replica-lag-monitor")
+        logger.info(f"Replica lag monitor started for {len(self.replicas)} replica(s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Replica lag monitor stopped")
+
+    def stats(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "max_lag_seconds": self.max_lag,
+            "primary_reads": self.primary_reads,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+
+replica_router = ReplicaRouter(
+    urls=[url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()],
+    strategy=settings.DB_REPLICA_STRATEGY,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+    sticky_window=settings.DB_READ_YOUR_WRITES_WINDOW,
+    sticky_max_entries=settings.DB_READ_YOUR_WRITES_MAX_ENTRIES
+)
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """Pin clients to the primary for a short window after a successful write."""
+    if not replica_router.enabled:
+        return await call_next(request)
+
+    key = replica_router.writer_key(request)
+    if request.method in SAFE_METHODS:
+        request.state.read_from_primary = replica_router.is_sticky(request, key)
+        return await call_next(request)
+
+    response = await call_next(request)
+    if response.status_code < 400:
+        replica_router.mark_write(key)
+        response.set_cookie(
+            STICKY_COOKIE,
+            str(time.time() + replica_router.sticky_window),
+            max_age=max(int(replica_router.sticky_window), 1),
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
+
+def read_sessionmaker(request: Request) -> async_sessionmaker:
+    """
+    Session factory for read-only work.
+
+    A healthy replica when one is available and the client has no recent
+    writes, otherwise the primary.
+    """
+    replica = None
+    if not getattr(request.state, "read_from_primary", False):
+        replica = replica_router.pick()
+
+    if replica is not None:
+        replica.sessions += 1
+        return replica.sessionmaker
+
+    replica_router.primary_reads += 1
+    return AsyncSessionLocal
+
+
+async def get_read_db(request: Request):
+    """
+    Dependency yielding a session for read-only work (see `read_sessionmaker`).
+
+    Streaming endpoints open their session with `read_sessionmaker` inside
+    the body generator instead, since dependencies are torn down before a
+    StreamingResponse is sent.
+    """
+    async with read_sessionmaker(request)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
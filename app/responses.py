@@ -0,0 +1,67 @@
+"""
+JSON (and streaming export) response helpers.
+
+The app's default response class is ORJSONResponse, but FastAPI still runs
+plain dict/list return values through `jsonable_encoder` first. Hot list
+endpoints bypass that by serializing rows straight to bytes with `dumps`
+and returning a `RawJSONResponse`, which sends the bytes as-is (and lets
+cached pages be served without re-encoding).
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence
+
+import orjson
+from fastapi.responses import Response
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"  # Starlette appends "; charset=utf-8"
+
+# datetimes -> ISO 8601 (same as jsonable_encoder); dict keys may be ints
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=DUMPS_OPTIONS)
+
+
+def loads(raw: bytes) -> Any:
+    return orjson.loads(raw)
+
+
+class RawJSONResponse(Response):
+    """Response for a body that is already JSON-encoded bytes."""
+
+    media_type = "application/json"
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> RawJSONResponse:
+    """Serialize `content` with orjson, skipping jsonable_encoder."""
+    return RawJSONResponse(dumps(content), status_code=status_code, headers=headers)
+
+
+def ndjson_chunk(fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """One JSON object per row, newline-terminated."""
+    return b"".join(dumps(dict(zip(fields, row))) + b"\n" for row in rows)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_chunk(rows: Sequence[Sequence[Any]]) -> bytes:
+    """CSV lines for `rows`; nested JSON values are written as JSON text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+    return buffer.getvalue().encode()
@@ -2,8 +2,11 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
+from app.replicas import get_read_db
 from app.auth import get_user_id
 from app.service_managers.budget_manager import BudgetManager
+from app.schemas import BudgetOut, BudgetAnalysisOut, BudgetRollupOut
+from app.responses import json_response
 
 budget = APIRouter(prefix="/budget", tags=["budget-categories"])
 
@@ -11,25 +14,37 @@ budget = APIRouter(prefix="/budget", tags=["budget-categories"])
 async def create_budget(
     payload: dict,
     db: Session = Depends(get_db),
+    user_id: int = Depends(get_user_id),
 ):
 
-    result = await BudgetManager.create_budget(db=db, payload=payload)
+    result = await BudgetManager.create_budget(db=db, payload=payload, user_id=user_id)
     return result
 
 
-@budget.get("/", status_code=status.HTTP_201_CREATED)
+@budget.get("/", status_code=status.HTTP_201_CREATED, response_model=List[BudgetOut])
 async def get_budgets(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
 ):
 
-    result = await BudgetManager.get_budgets(db=db)
-    return result
+    result = await BudgetManager.get_budgets(db=db, user_id=user_id)
+    return json_response(result, status_code=status.HTTP_201_CREATED)
 
 
-@budget.get("/{id}", status_code=status.HTTP_200_OK)
+@budget.get("/analysis", status_code=status.HTTP_200_OK, response_model=BudgetRollupOut)
+async def get_budgets_analysis(
+    db: Session = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+):
+
+    result = await BudgetManager.get_user_budget_analysis(db=db, user_id=user_id)
+    return json_response(result)
+
+
+@budget.get("/{id}", status_code=status.HTTP_200_OK, response_model=BudgetOut)
 async def get_budget_by_id(
     id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
 
     result = await BudgetManager.get_budget_by_id(db=db, id=id)
@@ -54,4 +69,15 @@ async def delete_budget(
 ):
 
     result = await BudgetManager.delete_budget(db=db, id=id)
-    return result
\ No newline at end of file
+    return result
+
+
+@budget.get("/{id}/analysis", status_code=status.HTTP_200_OK, response_model=BudgetAnalysisOut)
+async def get_budget_analysis(
+    id: int,
+    db: Session = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+):
+
+    result = await BudgetManager.get_budget_analysis(db=db, id=id, user_id=user_id)
+    return json_response(result)
@@ -36,16 +36,8 @@ async def get_upload_url(request: Request, payload: FileRequest, db: AsyncSessio
 @require_auth
 async def get_batch_upload_urls(request: Request, payload: BatchRequest, db: AsyncSession = Depends(get_db)):
     user = request.state.user
-    urls = [
-        await S3Manager.generate_presigned_url(
-            f.file_name,
-            f.content_type,
-            f.file_size,
-            user,
-            db
-        )
-        for f in payload.files
-    ]
+    files = [f.model_dump() for f in payload.files]
+    urls = await S3Manager.generate_presigned_urls(files, user, db)
     return {"urls": urls}
 
 @router.delete("/media", status_code=status.HTTP_200_OK)
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database_async import get_async_db
+from app.config import settings
+from app.database import get_db
+from app.etags import cache_headers, etag_matches, make_etag, not_modified
+from app.responses import json_response
+from app.replicas import get_read_db
 from app.auth import get_current_active_user
 from app.schemas import (
     ServiceCategoryCreate,
@@ -16,7 +20,7 @@ router = APIRouter(prefix="/service-categories", tags=["service-categories"])
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_service_category(
     payload: ServiceCategoryCreate,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_db),
     # current_user: dict = Depends(get_current_active_user)
 ):
 
@@ -26,21 +30,27 @@ async def create_service_category(
 
 @router.get("/")
 async def list_service_categories(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_read_db),
     # current_user: dict = Depends(get_current_active_user)
 ):
 
+    version = await ServiceCategoriesManagerAsync.service_categories_version(db)
+    etag = make_etag(version, skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.SERVICE_CATEGORIES_CACHE_CONTROL)
+    
     categories = await ServiceCategoriesManagerAsync.get_all_service_categories(db, skip, limit)
-    return categories
+    return json_response(categories, headers=cache_headers(etag, settings.SERVICE_CATEGORIES_CACHE_CONTROL))
 
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_service_category(
     category_id: int,
-    db: AsyncSession = Depends(get_async_db),
+    db: AsyncSession = Depends(get_db),
 ):
 
     deleted = await ServiceCategoriesManagerAsync.delete_service_category(db, category_id)
@@ -1,21 +1,33 @@
 from fastapi import APIRouter, Depends, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
+from app.etags import cache_headers, etag_matches, not_modified
+from app.replicas import get_read_db, read_sessionmaker
 from app.schemas import (
     VendorUpdate,
     VendorQueryParams,
+    VendorExportParams,
+    VendorMatchParams,
+    VendorDiscoverParams,
     VendorCreate,
     VendorDeactivate,
     UpdateMediaRequest,
-    DeleteMedia
+    DeleteMedia,
+    VendorOut,
+    VendorPage,
+    VendorMatchPage,
+    VendorDiscoverPage
 )
+from app.responses import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, RawJSONResponse, dumps, json_response
 from app.service_managers.vendor_manager import VendorManager
 from app.utils import require_auth
 
 router = APIRouter(prefix="/vendors", tags=["vendors"])
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=VendorOut)
 @require_auth
 async def create_vendor(
     request: Request,
@@ -27,34 +39,80 @@ async def create_vendor(
     return result
 
 
-@router.get("/")
+@router.get("/", response_model=VendorPage)
 # @require_auth
 async def list_vendors(
     request: Request,
     params: VendorQueryParams = Depends(),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     # user = request.state.user
-    vendors = await VendorManager.get_vendors(
+    version, etag = await VendorManager.listing_etag(db=db, params=params)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.VENDORS_CACHE_CONTROL)
+    
+    body = await VendorManager.get_vendors_json(
         db=db, 
-        params=params
+        params=params,
+        version=version
     )
-    return vendors
+    return RawJSONResponse(body, headers=cache_headers(etag, settings.VENDORS_CACHE_CONTROL))
+
+
+@router.get("/discover", response_model=VendorDiscoverPage)
+async def discover_vendors(
+    request: Request,
+    params: VendorDiscoverParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    version, etag = await VendorManager.discover_etag(db=db, params=params)
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.VENDORS_CACHE_CONTROL)
+    
+    result = await VendorManager.discover_vendors(db=db, params=params, version=version)
+    return RawJSONResponse(dumps(result), headers=cache_headers(etag, settings.VENDORS_CACHE_CONTROL))
 
 
-@router.get("/user_id")
+@router.get("/user_id", response_model=VendorPage)
 @require_auth
 async def list_vendors(
     request: Request,
     params: VendorQueryParams = Depends(),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     user = request.state.user
-    vendors = await VendorManager.get_vendors(
+    body = await VendorManager.get_vendors_json(
         db=db, 
         user=user
     )
-    return vendors
+    return RawJSONResponse(body)
+
+
+@router.get("/export")
+@require_auth
+async def export_vendors(
+    request: Request,
+    params: VendorExportParams = Depends(),
+):
+    media_type = CSV_MEDIA_TYPE if params.format == "csv" else NDJSON_MEDIA_TYPE
+    body = VendorManager.export_vendors(read_sessionmaker(request), params)
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="vendors.{params.format}"'}
+    )
+
+
+@router.get("/match", response_model=VendorMatchPage)
+@require_auth
+async def match_vendors(
+    request: Request,
+    params: VendorMatchParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    user = request.state.user
+    result = await VendorManager.match_vendors(db=db, params=params, user=user)
+    return json_response(result)
 
 
 @router.put("/update")
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.database import get_db
+from app.replicas import get_read_db
 from app.auth import get_user_id
 from app.schemas import (
     WeddingCoreCreate,
@@ -15,10 +16,18 @@ from app.models import Budget
 router = APIRouter(prefix="/weddings", tags=["weddings"])
 
 
+def wedding_not_found() -> HTTPException:
+    # Ownership is part of the query, so another user's wedding is indistinguishable from a missing one
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Wedding not found"
+    )
+
+
 @router.post("/", response_model=WeddingCoreResponse, status_code=status.HTTP_201_CREATED)
-def create_wedding(
+async def create_wedding(
     wedding: WeddingCoreCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_user_id)
 ):
     """
@@ -33,37 +42,45 @@ def create_wedding(
         Created wedding
     """
     wedding_data = wedding.model_dump()
-    db_wedding = wedding_core_crud.create_for_user(db, user_id, wedding_data)
+    db_wedding = await wedding_core_crud.create_for_user(db, user_id, wedding_data)
+    await db.commit()
     return db_wedding
 
 
 @router.get("/", response_model=List[WeddingCoreResponse])
-def list_weddings(
+async def list_weddings(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     user_id: int = Depends(get_user_id)
 ):
     """
     Get all weddings for the authenticated user.
     
     Args:
-        skip: Number of records to skip
+        skip: Number of records to skip (ignored when a cursor is given)
         limit: Maximum number of records to return
+        cursor: Keyset cursor from the previous page's X-Next-Cursor header
         db: Database session
         user_id: Authenticated user ID
         
     Returns:
         List of weddings
     """
-    weddings = wedding_core_crud.get_by_user(db, user_id, skip, limit)
+    weddings, next_cursor = await wedding_core_crud.get_by_user(
+        db, user_id, limit=limit, cursor=cursor, skip=skip
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return weddings
 
 
 @router.get("/{wedding_id}", response_model=WeddingCoreResponse)
-def get_wedding(
+async def get_wedding(
     wedding_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user_id: int = Depends(get_user_id)
 ):
     """
@@ -78,30 +95,19 @@ def get_wedding(
         Wedding details
         
     Raises:
-        HTTPException: If wedding not found or user doesn't have access
+        HTTPException: If the wedding does not exist or belongs to another user
     """
-    wedding = wedding_core_crud.get(db, wedding_id)
-    
+    wedding = await wedding_core_crud.get(db, wedding_id, Budget.user_id == user_id)
     if not wedding:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Wedding not found"
-        )
-    
-    if wedding.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this wedding"
-        )
-    
+        raise wedding_not_found()
     return wedding
 
 
 @router.put("/{wedding_id}", response_model=WeddingCoreResponse)
-def update_wedding(
+async def update_wedding(
     wedding_id: int,
     wedding: WeddingCoreUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_user_id)
 ):
     """
@@ -117,31 +123,20 @@ def update_wedding(
         Updated wedding
         
     Raises:
-        HTTPException: If wedding not found or user doesn't have access
+        HTTPException: If the wedding does not exist or belongs to another user
     """
-    db_wedding = wedding_core_crud.get(db, wedding_id)
-    
-    if not db_wedding:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Wedding not found"
-        )
-    
-    if db_wedding.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this wedding"
-        )
-    
     update_data = wedding.model_dump(exclude_unset=True)
-    updated_wedding = wedding_core_crud.update(db, db_wedding, update_data)
+    updated_wedding = await wedding_core_crud.update(db, wedding_id, update_data, Budget.user_id == user_id)
+    if not updated_wedding:
+        raise wedding_not_found()
+    await db.commit()
     return updated_wedding
 
 
 @router.delete("/{wedding_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_wedding(
+async def delete_wedding(
     wedding_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_user_id)
 ):
     """
@@ -153,21 +148,10 @@ def delete_wedding(
         user_id: Authenticated user ID
         
     Raises:
-        HTTPException: If wedding not found or user doesn't have access
+        HTTPException: If the wedding does not exist or belongs to another user
     """
-    db_wedding = wedding_core_crud.get(db, wedding_id)
-    
-    if not db_wedding:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Wedding not found"
-        )
-    
-    if db_wedding.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this wedding"
-        )
-    
-    wedding_core_crud.delete(db, wedding_id)
-    return None
\ No newline at end of file
+    deleted = await wedding_core_crud.delete(db, wedding_id, Budget.user_id == user_id)
+    if not deleted:
+        raise wedding_not_found()
+    await db.commit()
+    return None
@@ -0,0 +1,55 @@
+"""
+Startup check that the database is migrated to the code's Alembic head.
+
+Schema changes are applied out of band with `alembic upgrade head` (see
+`make migrate`). Workers only read the single row in `alembic_version`,
+so booting N replicas no longer runs catalog introspection on every one.
+"""
+import logging
+from pathlib import Path
+from typing import Optional
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def expected_revision() -> str:
+    """Head revision of the migration scripts shipped with this build."""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+async def current_revision(engine: AsyncEngine) -> Optional[str]:
+    """Revision recorded in the database, or None if it was never migrated."""
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            return None
+        return result.scalar_one_or_none()
+
+
+async def check_schema_version(engine: AsyncEngine) -> str:
+    """
+    Fail fast when the database is not at the expected revision.
+
+    Raises RuntimeError so the worker exits instead of serving requests
+    against a schema it was not written for.
+    """
+    expected = expected_revision()
+    current = await current_revision(engine)
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at revision {current or 'none'}, expected {expected}. "
+            f"Run `alembic upgrade head` before starting the service."
+        )
+    logger.info(f"Database schema at revision {current}")
+    return current
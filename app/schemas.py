@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 
 
@@ -8,7 +8,6 @@ class WeddingCoreBase(BaseModel):
     """Base schema for Wedding."""
     name: str = Field(..., min_length=1, max_length=255)
     total_budget: Optional[int] = None
-    spent_budget: Optional[int] = 0
 
 
 class WeddingCoreCreate(WeddingCoreBase):
@@ -20,13 +19,13 @@ class WeddingCoreUpdate(BaseModel):
     """Schema for updating a wedding."""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     total_budget: Optional[int] = None
-    spent_budget: Optional[int] = None
 
 
 class WeddingCoreResponse(WeddingCoreBase):
     """Schema for wedding response."""
     id: int
     user_id: int
+    spent_budget: Optional[int] = 0
     created_at: datetime
     updated_at: datetime
     
@@ -40,7 +39,6 @@ class BudgetCategoryBase(BaseModel):
     budget_cat: Optional[int] = None
     budget_amt: Optional[int] = None
     actual_cost: Optional[int] = None
-    remaining: Optional[int] = None
 
 
 class BudgetCategoryCreate(BudgetCategoryBase):
@@ -53,13 +51,13 @@ class BudgetCategoryUpdate(BaseModel):
     budget_cat: Optional[int] = None
     budget_amt: Optional[int] = None
     actual_cost: Optional[int] = None
-    remaining: Optional[int] = None
 
 
 class BudgetCategoryResponse(BudgetCategoryBase):
     """Schema for budget category response."""
     id: int
     wedding_id: int
+    remaining: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     
@@ -217,6 +215,213 @@ class VendorQueryParams(BaseModel):
     name: Optional[str] = None
     vendor_id: Optional[int] = None
     user_id: Optional[str] = None
+    sort: Literal["id", "created_at", "lower_range", "upper_range"] = "id"
+    order: Literal["asc", "desc"] = "asc"
+    cursor: Optional[str] = Field(None, description="Opaque next_cursor from the previous page; overrides skip")
+    q: Optional[str] = Field(None, min_length=1, max_length=100, description="Fuzzy search over name, city and district")
+    fields: Optional[str] = Field(
+        None,
+        max_length=300,
+        description="Comma-separated fields to return (id is always included), e.g. name,city,lower_range,upper_range,cover_image"
+    )
+
+
+class VendorExportParams(BaseModel):
+    format: Literal["ndjson", "csv"] = "ndjson"
+    service_id: Optional[int] = None
+    city: Optional[str] = Field(None, min_length=1, max_length=100, description="Exact city, case-insensitive")
+    is_active: bool = True
+
+
+class VendorMatchParams(BaseModel):
+    service_id: Optional[int] = Field(None, description="Service category; defaults to the budget category's")
+    city: str = Field(..., min_length=1, max_length=100, description="Exact city, case-insensitive")
+    district: Optional[str] = Field(None, min_length=1, max_length=100, description="Exact district, case-insensitive")
+    budget: Optional[int] = Field(None, ge=0, le=2**31 - 1, description="Amount available; defaults to the budget category's remaining amount")
+    budget_category_id: Optional[int] = Field(None, description="Your budget category to match vendors for")
+    limit: int = Field(20, ge=1, le=100)
+    fields: Optional[str] = Field(None, max_length=300, description="Comma-separated fields to return, as for the vendor listing")
+
+
+class VendorDiscoverParams(BaseModel):
+    service_id: Optional[int] = None
+    city: Optional[str] = Field(None, min_length=1, max_length=100, description="Exact city, case-insensitive")
+    district: Optional[str] = Field(None, min_length=1, max_length=100, description="Exact district, case-insensitive")
+    price_band: Optional[Literal["under_50k", "50k_1l", "1l_2l", "2l_5l", "5l_plus"]] = Field(
+        None,
+        description="Starting-price band (lower_range)"
+    )
+    sort: Literal["id", "created_at", "lower_range", "upper_range"] = "id"
+    order: Literal["asc", "desc"] = "asc"
+    cursor: Optional[str] = Field(None, description="Opaque next_cursor from the previous page")
+    limit: int = Field(24, ge=1, le=100)
+    facet_limit: int = Field(20, ge=1, le=100, description="Most buckets returned per facet")
+    fields: Optional[str] = Field(None, max_length=300, description="Comma-separated fields to return, as for the vendor listing")
+
+
+# Vendor listing output (documents the payload; list pages are serialized straight to bytes)
+class VendorMediaOut(BaseModel):
+    id: int
+    media_type: Optional[str] = None
+    url: Optional[str] = None
+
+
+class VendorCategoryOut(BaseModel):
+    id: int
+    name: str
+
+
+class VendorOut(BaseModel):
+    id: int
+    name: str
+    phone1: Optional[str] = None
+    phone2: Optional[str] = None
+    city: Optional[str] = None
+    district: Optional[str] = None
+    address: Optional[str] = None
+    lower_range: Optional[int] = None
+    upper_range: Optional[int] = None
+    email: Optional[str] = None
+    meta: Optional[dict] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    service_category: Optional[VendorCategoryOut] = None
+    vendor_media: List[VendorMediaOut] = []
+
+
+class VendorListItem(VendorOut):
+    """Listing row; with `fields=` only the requested keys (and id) are present."""
+    name: Optional[str] = None
+    cover_image: Optional[str] = Field(None, description="First live image URL; only returned when requested via fields")
+
+
+class VendorPage(BaseModel):
+    items: List[VendorListItem]
+    next_cursor: Optional[str] = None
+
+
+class FacetCategoryBucket(BaseModel):
+    id: int
+    name: Optional[str] = None
+    count: int
+
+
+class FacetValueBucket(BaseModel):
+    value: str
+    count: int
+
+
+class FacetPriceBandBucket(BaseModel):
+    key: str
+    label: str
+    min: Optional[int] = None
+    max: Optional[int] = None
+    count: int
+
+
+class VendorFacets(BaseModel):
+    service_category: List[FacetCategoryBucket]
+    city: List[FacetValueBucket]
+    district: List[FacetValueBucket]
+    price_band: List[FacetPriceBandBucket]
+
+
+class VendorDiscoverPage(VendorPage):
+    total: int
+    facets: VendorFacets
+
+
+class VendorMatchItem(VendorListItem):
+    fit: Literal["within", "partial"]
+    overshoot: Optional[int] = None
+
+
+class VendorMatchPage(BaseModel):
+    service_id: int
+    city: str
+    budget: int
+    items: List[VendorMatchItem]
+
+
+# Budget output
+class BudgetCategoryOut(BaseModel):
+    id: int
+    budget_cat: Optional[int] = None
+    budget_amt: Optional[int] = None
+    actual_cost: Optional[int] = None
+    remaining: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class BudgetOut(BaseModel):
+    id: int
+    user_id: int
+    name: str
+    total_budget: Optional[int] = None
+    spent_budget: Optional[int] = None
+    remaining_budget: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    budget_categories: List[BudgetCategoryOut]
+    categories_count: int
+
+
+# Budget allocation analysis
+class BudgetCategoryAnalysisOut(BaseModel):
+    id: int
+    budget_cat: int
+    name: Optional[str] = None
+    percentage: Optional[int] = None
+    recommended: Optional[int] = None
+    planned: Optional[int] = None
+    actual: Optional[int] = None
+    planned_vs_recommended: Optional[int] = None
+    actual_vs_planned: int
+    projected: int
+    allocation_status: Optional[Literal["over", "under", "on_track"]] = None
+    spend_status: Literal["over", "within"]
+
+
+class BudgetAnalysisTotals(BaseModel):
+    total_budget: Optional[int] = None
+    spent_budget: Optional[int] = None
+    recommended: Optional[int] = None
+    planned: int
+    actual: int
+    projected: int
+    unallocated: Optional[int] = None
+    projected_remaining: Optional[int] = None
+    projected_overrun: Optional[int] = None
+    categories_count: int
+    over_allocated: int
+    under_allocated: int
+    over_spent: int
+
+
+class BudgetAnalysisOut(BaseModel):
+    budget_id: int
+    name: str
+    tolerance: float
+    totals: BudgetAnalysisTotals
+    categories: List[BudgetCategoryAnalysisOut]
+
+
+class BudgetRollupItem(BudgetAnalysisTotals):
+    budget_id: int
+    name: str
+
+
+class BudgetRollupTotals(BudgetAnalysisTotals):
+    budgets_count: int
+
+
+class BudgetRollupOut(BaseModel):
+    user_id: int
+    tolerance: float
+    totals: BudgetRollupTotals
+    budgets: List[BudgetRollupItem]
+
     
 class VendorUpdate(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -4,20 +4,41 @@ import httpx
 import logging
 import base64
 import uuid
+import time
 import jwt
+from app.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 class AuthServiceClient:
     
+    _service_token = None
+    _service_token_expires_at = 0.0
+    
     @classmethod
     def _generate_service_token(cls) -> str:
-        """Create a simple service-to-service JWT from env secret."""
+        """
+        Return a service-to-service JWT signed with the env secret.
+        
+        The token is cached and only re-signed once it is within
+        AUTH_SERVICE_TOKEN_REFRESH_MARGIN seconds of its expiry.
+        """
+        now = time.time()
+        if cls._service_token and now < cls._service_token_expires_at - settings.AUTH_SERVICE_TOKEN_REFRESH_MARGIN:
+            return cls._service_token
+        
         secret = (settings.AUTH_SERVICE_TOKEN or "").strip()
         if not secret:
             raise RuntimeError("AUTH_SERVICE_TOKEN is not configured")
 
-        return jwt.encode({"service": settings.AUTH_SERVICE_TOKEN}, secret, algorithm="HS256")
+        expires_at = int(now) + settings.AUTH_SERVICE_TOKEN_TTL
+        cls._service_token = jwt.encode(
+            {"service": settings.AUTH_SERVICE_TOKEN, "iat": int(now), "exp": expires_at},
+            secret,
+            algorithm="HS256"
+        )
+        cls._service_token_expires_at = expires_at
+        return cls._service_token
     
     @staticmethod
     def _extract_error_message(resp: httpx.Response) -> str:
@@ -50,10 +71,9 @@ class AuthServiceClient:
         headers = {
             "Authorization": f"Bearer {token}"
         }
-        async with httpx.AsyncClient(timeout=settings.AUTH_SERVICE_TIMEOUT) as client:
-            path = f"{settings.AUTH_SERVICE_URL}/api/v1/auth/add-vendor-role"
-            auth_response = await client.post(path,json=payload, headers=headers)
-                
-            if not auth_response.is_success:
-                msg = cls._extract_error_message(auth_response)
-                raise HTTPException(status_code=auth_response.status_code, detail=f"Unable to update role: {msg}")
\ No newline at end of file
+        path = f"{settings.AUTH_SERVICE_URL}/api/v1/auth/add-vendor-role"
+        auth_response = await get_http_client().post(path, json=payload, headers=headers)
+            
+        if not auth_response.is_success:
+            msg = cls._extract_error_message(auth_response)
+            raise HTTPException(status_code=auth_response.status_code, detail=f"Unable to update role: {msg}")
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Pure-Python AWS Signature Version 4 query-string presigner for S3.
+
+Presigning is CPU-only work, but botocore's implementation is slow enough to
+stall the event loop under load. This signer covers the one operation we
+need (PUT object with a Content-Type) and caches the derived signing key,
+which only changes once per day/region/service.
+"""
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _uri_encode(value: str, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+class S3Presigner:
+    """Generates SigV4 presigned S3 URLs without touching the network."""
+
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        bucket: str,
+        session_token: Optional[str] = None,
+        service: str = "s3",
+    ):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.bucket = bucket
+        self.session_token = session_token
+        self.service = service
+        self.host = f"{bucket}.s3.{region}.amazonaws.com"
+        self._signing_key: Optional[Tuple[str, bytes]] = None
+
+    def _get_signing_key(self, datestamp: str) -> bytes:
+        """Derive (and cache) the signing key for `datestamp` (YYYYMMDD)."""
+        cached = self._signing_key
+        if cached is not None and cached[0] == datestamp:
+            return cached[1]
+
+        k_date = _hmac(("AWS4" + self.secret_key).encode("utf-8"), datestamp)
+        k_region = _hmac(k_date, self.region)
+        k_service = _hmac(k_region, self.service)
+        key = _hmac(k_service, "aws4_request")
+        self._signing_key = (datestamp, key)
+        return key
+
+    def presign_put(
+        self,
+        key: str,
+        content_type: str,
+        expires_in: int = 3600,
+        now: Optional[datetime] = None,
+    ) -> str:
+        """
+        Build a presigned PUT URL for `key`.
+
+        The Content-Type is part of the signature, so the upload must send
+        exactly the same header.
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = amz_date[:8]
+        scope = f"{datestamp}/{self.region}/{self.service}/aws4_request"
+        content_type = " ".join(content_type.split())
+
+        query = {
+            "X-Amz-Algorithm": ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": "content-type;host",
+        }
+        if self.session_token:
+            query["X-Amz-Security-Token"] = self.session_token
+
+        canonical_uri = "/" + _uri_encode(key, safe="-_.~/")
+        canonical_query = "&".join(
+            f"{_uri_encode(k)}={_uri_encode(v)}" for k, v in sorted(query.items())
+        )
+        canonical_request = "\n".join((
+            "PUT",
+            canonical_uri,
+            canonical_query,
+            f"content-type:{content_type}\nhost:{self.host}\n",
+            "content-type;host",
+            UNSIGNED_PAYLOAD,
+        ))
+        string_to_sign = "\n".join((
+            ALGORITHM,
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ))
+        signature = hmac.new(
+            self._get_signing_key(datestamp),
+            string_to_sign.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        return f"https://{self.host}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
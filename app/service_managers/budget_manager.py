@@ -1,34 +1,130 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import Budget, BudgetCategory
+from sqlalchemy import select, insert, update, values, column, literal, cast, true, func, text, case, tuple_, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime
+from typing import Optional
+from app.config import settings
+from app.models import Budget, BudgetCategory, ServiceCategory
 from fastapi import HTTPException, status
 from sqlalchemy.orm import selectinload
-from app.auth import get_user_id
+
+
+# Client-writable category fields; `remaining` (generated column) and the
+# budget's `spent_budget` (trigger-maintained) are derived server-side
+CATEGORY_FIELDS = ("budget_cat", "budget_amt", "actual_cost", "meta")
+
+# Per-category analysis fields, in response order
+ANALYSIS_CATEGORY_FIELDS = (
+    "id", "budget_cat", "name", "percentage", "recommended", "planned", "actual",
+    "planned_vs_recommended", "actual_vs_planned", "projected", "allocation_status", "spend_status",
+)
+# Budget-level (and rollup) totals
+ANALYSIS_TOTAL_FIELDS = (
+    "total_budget", "spent_budget", "recommended", "planned", "actual", "projected",
+    "unallocated", "projected_remaining", "projected_overrun",
+    "categories_count", "over_allocated", "under_allocated", "over_spent",
+)
 
 
 class BudgetManager:
     
     @classmethod
-    async def create_budget(cls, db: AsyncSession, payload: dict, user_id: str):
-        total_budget = payload.get("budget")
-        name = payload.get("name")
+    def _category_rows(cls, budget_categories: list) -> list:
+        """
+        Normalize category payloads, keeping the last entry per budget_cat.
+
+        Rows are sorted by budget_cat so concurrent upserts on one budget lock
+        its category rows (and then, via the spent trigger, the budget row)
+        in the same order instead of deadlocking.
+        """
+        rows = {}
+        for category in budget_categories or []:
+            budget_cat = category.get("budget_cat")
+            if budget_cat is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="budget_cat is required for every budget category",
+                )
+            rows[budget_cat] = {
+                "budget_cat": budget_cat,
+                "budget_amt": category.get("budget_amt"),
+                "actual_cost": category.get("actual_cost", 0),
+                "meta": category.get("meta"),
+            }
+        return [rows[budget_cat] for budget_cat in sorted(rows)]
+    
+    @classmethod
+    def _upsert_categories_stmt(cls, budget_id: int, rows: list):
+        """Single INSERT ... ON CONFLICT (budget_id, budget_cat) DO UPDATE ... RETURNING."""
+        now = datetime.utcnow()
+        stmt = pg_insert(BudgetCategory).values([
+            {**row, "budget_id": budget_id, "created_at": now, "updated_at": now}
+            for row in rows
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=[BudgetCategory.budget_id, BudgetCategory.budget_cat],
+            set_={
+                **{field: stmt.excluded[field] for field in CATEGORY_FIELDS if field != "budget_cat"},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(BudgetCategory.id, BudgetCategory.budget_cat)
+    
+    @classmethod
+    async def create_budget(cls, db: AsyncSession, payload: dict, user_id: int):
+        """Create the budget and its categories atomically in one statement."""
+        rows = cls._category_rows(payload.get("budget_categories"))
+        now = datetime.utcnow()
         
-        new_budget = Budget(
+        budget_stmt = pg_insert(Budget).values(
             user_id=user_id,
-            name=name,
-            total_budget=total_budget   
-        )
+            name=payload.get("name"),
+            total_budget=payload.get("budget"),
+            spent_budget=0,
+            meta=payload.get("meta"),
+            created_at=now,
+            updated_at=now,
+        ).returning(Budget.id)
         
-        db.add(new_budget)
-        await db.commit()
-        await db.refresh(new_budget)
+        if not rows:
+            result = await db.execute(budget_stmt)
+            budget_id = result.scalar_one()
+            await db.commit()
+            return {"msg": "Budget created", "budget_id": budget_id}
         
-        budget_id = new_budget.id
-        await cls.update_budget_categories(db, payload, budget_id)
+        # WITH new_budget AS (INSERT INTO budget ... RETURNING id)
+        # INSERT INTO budget_categories SELECT new_budget.id, v.* FROM new_budget, (VALUES ...) v
+        new_budget = budget_stmt.cte("new_budget")
+        category_values = values(
+            column("budget_cat", Integer),
+            column("budget_amt", Integer),
+            column("actual_cost", Integer),
+            column("meta", JSON),
+            name="category_values",
+        ).data([tuple(row[field] for field in CATEGORY_FIELDS) for row in rows])
+        
+        stmt = insert(BudgetCategory).from_select(
+            ["budget_id", *CATEGORY_FIELDS, "created_at", "updated_at"],
+            select(
+                new_budget.c.id,
+                # Explicit casts: NULLs in VALUES would otherwise be typed as text
+                *(cast(category_values.c[field], BudgetCategory.__table__.c[field].type) for field in CATEGORY_FIELDS),
+                literal(now, DateTime),
+                literal(now, DateTime),
+            ).select_from(new_budget).join(category_values, true()),
+        ).returning(BudgetCategory.budget_id, BudgetCategory.id)
+        
+        result = await db.execute(stmt)
+        created = result.all()
+        await db.commit()
+        return {
+            "msg": "Budget created",
+            "budget_id": created[0].budget_id,
+            "categories_count": len(created),
+        }
         
         
     @classmethod
-    async def update_budget_categories(cls, db: AsyncSession, payload: dict, budget_id: int=None):
+    async def update_budget_categories(cls, db: AsyncSession, payload: dict, budget_id: int=None, commit: bool=True):
         budget_id = budget_id or payload.get("budget_id")
         if not budget_id:
             raise HTTPException(
@@ -36,29 +132,19 @@ class BudgetManager:
                 detail="Budget ID not passed",
             )
             
-        budget_categories = payload.get("budget_categories")
+        rows = cls._category_rows(payload.get("budget_categories"))
+        if not rows:
+            return {"msg": "Budget updated", "budget_categories": []}
         
-        for categories in budget_categories:
-            name = categories.get("name")
-            stmt = select(BudgetCategory).filter(BudgetCategory.name == name, BudgetCategory.budget_id == budget_id)
-            category = await db.execute(stmt)
-            
-            if not category:
-                category = BudgetCategory(
-                    budget_id=budget_id,
-                    name=name
-                )
-            
-            category.total_cost = categories.get("total_cost")
-            category.actual_cost = categories.get("actual_cost",0)
-            category.remarks = categories.get("remarks")
-            
-        await db.commit()
-        return {"msg": "Budget updated"}
+        result = await db.execute(cls._upsert_categories_stmt(budget_id, rows))
+        categories = [{"id": row.id, "budget_cat": row.budget_cat} for row in result]
+        
+        if commit:
+            await db.commit()
+        return {"msg": "Budget updated", "budget_categories": categories}
     
     @classmethod
-    async def get_budgets(cls, db: AsyncSession):
-        user_id = get_user_id()
+    async def get_budgets(cls, db: AsyncSession, user_id: int):
         if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -172,18 +258,45 @@ class BudgetManager:
             budget.name = payload["name"]
         if "total_budget" in payload:
             budget.total_budget = payload["total_budget"]
-        if "spent_budget" in payload:
-            budget.spent_budget = payload["spent_budget"]
-        
-        await db.commit()
-        await db.refresh(budget)
+        # spent_budget is maintained from the categories' actual_cost; ignore client values
         
-        # Update budget categories if provided
+        # Budget and categories are saved in the same transaction
         if "budget_categories" in payload:
-            await cls.update_budget_categories(db, payload, budget_id=id)
+            await cls.update_budget_categories(db, payload, budget_id=id, commit=False)
+        
+        await db.commit()
         
         return {"msg": "Budget updated successfully", "budget_id": id}
     
+    @classmethod
+    async def reconcile_spent_budgets(cls, db: AsyncSession) -> int:
+        """
+        Recompute every budget's spent_budget from its categories.
+
+        One set-based UPDATE ... FROM (SELECT ... GROUP BY) under a SHARE lock
+        on budget_categories, so no trigger delta can land between the sums
+        and the update. Returns the number of budgets that were corrected.
+        """
+        await db.execute(text("LOCK TABLE budget_categories IN SHARE MODE"))
+        totals = (
+            select(Budget.id, func.coalesce(func.sum(BudgetCategory.actual_cost), 0).label("spent"))
+            .select_from(Budget)
+            .outerjoin(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+            .group_by(Budget.id)
+            .subquery("totals")
+        )
+        stmt = (
+            update(Budget)
+            .where(Budget.id == totals.c.id, Budget.spent_budget.is_distinct_from(totals.c.spent))
+            .values(spent_budget=totals.c.spent)
+            .returning(Budget.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        corrected = len(result.all())
+        await db.commit()
+        return corrected
+    
     @classmethod
     async def delete_budget(cls, db: AsyncSession, id: int):
         if not id:
@@ -207,4 +320,201 @@ class BudgetManager:
         await db.delete(budget)
         await db.commit()
         
-        return {"msg": f"Budget with ID {id} deleted successfully"}
\ No newline at end of file
+        return {"msg": f"Budget with ID {id} deleted successfully"}
+    
+    @classmethod
+    def _allocation_rows(cls, user_id: int, budget_id: Optional[int] = None):
+        """
+        One row per (budget, category) of the user, compared against the
+        category's recommended share (ServiceCategory.percentage of
+        total_budget). Budgets without categories yield a single row with
+        NULL category columns.
+
+        A category is over/under-allocated when its planned amount falls
+        outside recommended +/- BUDGET_ALLOCATION_TOLERANCE, and over-spent
+        when its actual cost exceeds the planned amount. Its projected cost
+        is the larger of the two: money planned is assumed to be spent, and
+        an overrun already incurred is not recovered.
+        """
+        tolerance = settings.BUDGET_ALLOCATION_TOLERANCE
+        recommended = cast(func.round(Budget.total_budget * ServiceCategory.percentage / 100.0), Integer)
+        planned = func.coalesce(BudgetCategory.budget_amt, 0)
+        actual = func.coalesce(BudgetCategory.actual_cost, 0)
+
+        allocation_status = case(
+            (recommended.is_(None), None),
+            (planned > recommended * (1 + tolerance), "over"),
+            (planned < recommended * (1 - tolerance), "under"),
+            else_="on_track",
+        )
+        spend_status = case(
+            (BudgetCategory.id.is_(None), None),
+            (actual > planned, "over"),
+            else_="within",
+        )
+
+        stmt = select(
+            Budget.id.label("budget_id"),
+            Budget.name.label("budget_name"),
+            Budget.total_budget,
+            Budget.spent_budget,
+            BudgetCategory.id.label("id"),
+            BudgetCategory.budget_cat,
+            ServiceCategory.name.label("name"),
+            ServiceCategory.percentage,
+            recommended.label("recommended"),
+            BudgetCategory.budget_amt.label("planned"),
+            BudgetCategory.actual_cost.label("actual"),
+            (planned - recommended).label("planned_vs_recommended"),
+            (actual - planned).label("actual_vs_planned"),
+            func.greatest(planned, actual).label("projected"),
+            allocation_status.label("allocation_status"),
+            spend_status.label("spend_status"),
+        ).select_from(Budget).outerjoin(
+            BudgetCategory, BudgetCategory.budget_id == Budget.id
+        ).outerjoin(
+            ServiceCategory, ServiceCategory.id == BudgetCategory.budget_cat
+        ).where(Budget.user_id == user_id)
+
+        if budget_id is not None:
+            stmt = stmt.where(Budget.id == budget_id)
+        return stmt.subquery("allocation")
+
+    @classmethod
+    def _allocation_totals(cls, total_budget, planned, projected):
+        """Projection columns shared by the per-budget and rollup queries."""
+        return [
+            (total_budget - planned).label("unallocated"),
+            (total_budget - projected).label("projected_remaining"),
+            func.greatest(projected - total_budget, 0).label("projected_overrun"),
+        ]
+
+    @classmethod
+    async def get_budget_analysis(cls, db: AsyncSession, id: int, user_id: int):
+        """
+        Allocation analysis of one budget: per-category rows plus budget
+        totals (window aggregates over the same rows), in one query.
+        """
+        rows = cls._allocation_rows(user_id, budget_id=id)
+        window = {"partition_by": rows.c.budget_id}
+        count = func.count(rows.c.id)
+
+        recommended = func.sum(rows.c.recommended).over(**window)
+        planned = func.coalesce(func.sum(rows.c.planned).over(**window), 0)
+        actual = func.coalesce(func.sum(rows.c.actual).over(**window), 0)
+        projected = func.coalesce(func.sum(rows.c.projected).over(**window), 0)
+
+        stmt = select(
+            rows,
+            recommended.label("recommended_total"),
+            planned.label("planned_total"),
+            actual.label("actual_total"),
+            projected.label("projected_total"),
+            *cls._allocation_totals(rows.c.total_budget, planned, projected),
+            count.over(**window).label("categories_count"),
+            count.filter(rows.c.allocation_status == "over").over(**window).label("over_allocated"),
+            count.filter(rows.c.allocation_status == "under").over(**window).label("under_allocated"),
+            count.filter(rows.c.spend_status == "over").over(**window).label("over_spent"),
+        ).order_by(rows.c.budget_cat)
+
+        result = await db.execute(stmt)
+        records = result.mappings().all()
+
+        if not records:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Budget with ID {id} not found"
+            )
+
+        first = records[0]
+        return {
+            "budget_id": first["budget_id"],
+            "name": first["budget_name"],
+            "tolerance": settings.BUDGET_ALLOCATION_TOLERANCE,
+            "totals": {
+                "total_budget": first["total_budget"],
+                "spent_budget": first["spent_budget"],
+                "recommended": first["recommended_total"],
+                "planned": first["planned_total"],
+                "actual": first["actual_total"],
+                "projected": first["projected_total"],
+                "unallocated": first["unallocated"],
+                "projected_remaining": first["projected_remaining"],
+                "projected_overrun": first["projected_overrun"],
+                "categories_count": first["categories_count"],
+                "over_allocated": first["over_allocated"],
+                "under_allocated": first["under_allocated"],
+                "over_spent": first["over_spent"],
+            },
+            "categories": [
+                {field: record[field] for field in ANALYSIS_CATEGORY_FIELDS}
+                for record in records if record["id"] is not None
+            ],
+        }
+
+    @classmethod
+    async def get_user_budget_analysis(cls, db: AsyncSession, user_id: int):
+        """
+        Allocation rollup of every budget of the user: per-budget totals and
+        the grand total, computed by one GROUPING SETS query.
+        """
+        rows = cls._allocation_rows(user_id)
+        count = func.count(rows.c.id)
+
+        per_budget = select(
+            rows.c.budget_id,
+            rows.c.budget_name,
+            rows.c.total_budget,
+            rows.c.spent_budget,
+            func.sum(rows.c.recommended).label("recommended"),
+            func.coalesce(func.sum(rows.c.planned), 0).label("planned"),
+            func.coalesce(func.sum(rows.c.actual), 0).label("actual"),
+            func.coalesce(func.sum(rows.c.projected), 0).label("projected"),
+            count.label("categories_count"),
+            count.filter(rows.c.allocation_status == "over").label("over_allocated"),
+            count.filter(rows.c.allocation_status == "under").label("under_allocated"),
+            count.filter(rows.c.spend_status == "over").label("over_spent"),
+        ).group_by(
+            rows.c.budget_id, rows.c.budget_name, rows.c.total_budget, rows.c.spent_budget
+        ).subquery("per_budget")
+
+        # Budget-level sets sum a single row; the empty set is the grand total
+        # (a row even when the user has no budgets, hence the coalesces)
+        sums = {
+            field: cast(func.sum(per_budget.c[field]), Integer)
+            for field in ("total_budget", "spent_budget", "recommended")
+        }
+        sums.update({
+            field: cast(func.coalesce(func.sum(per_budget.c[field]), 0), Integer)
+            for field in ("planned", "actual", "projected")
+        })
+        stmt = select(
+            func.grouping(per_budget.c.budget_id).label("is_total"),
+            per_budget.c.budget_id,
+            per_budget.c.budget_name,
+            *(expression.label(field) for field, expression in sums.items()),
+            *cls._allocation_totals(sums["total_budget"], sums["planned"], sums["projected"]),
+            *(
+                cast(func.coalesce(func.sum(per_budget.c[field]), 0), Integer).label(field)
+                for field in ("categories_count", "over_allocated", "under_allocated", "over_spent")
+            ),
+            func.count(per_budget.c.budget_id).label("budgets_count"),
+        ).group_by(
+            func.grouping_sets(tuple_(per_budget.c.budget_id, per_budget.c.budget_name), tuple_())
+        ).order_by(text("is_total"), per_budget.c.budget_id)
+
+        result = await db.execute(stmt)
+        budgets, totals = [], None
+        for record in result.mappings():
+            summary = {field: record[field] for field in ANALYSIS_TOTAL_FIELDS}
+            if record["is_total"]:
+                totals = {"budgets_count": record["budgets_count"], **summary}
+            else:
+                budgets.append({"budget_id": record["budget_id"], "name": record["budget_name"], **summary})
+
+        return {
+            "user_id": user_id,
+            "tolerance": settings.BUDGET_ALLOCATION_TOLERANCE,
+            "totals": totals,
+            "budgets": budgets,
+        }
@@ -0,0 +1,174 @@
+"""
+Background purge of tombstoned vendor media.
+
+`S3Manager.delete_media` only marks rows with `deleted_at`. This worker drains
+those rows in DeleteObjects batches and removes the rows whose objects are
+gone. A failed delete bumps `delete_attempts` and pushes
+`next_delete_attempt_at` back exponentially; rows that use up
+MEDIA_DELETE_MAX_ATTEMPTS stay in the table (their objects are still in S3)
+and are reported by `stats()` until someone resets `delete_attempts`.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, delete, func, literal, or_, select, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import VendorMedia
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+MAX_DELETE_BATCH = 1000
+
+
+class MediaDeletionWorker:
+
+    def __init__(self, interval: float, batch_size: int, max_attempts: int, retry_backoff: float):
+        self.interval = interval
+        self.batch_size = min(batch_size, MAX_DELETE_BATCH)
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        # Counters since this process started
+        self.deleted = 0
+        self.failed = 0
+        self.exhausted = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="media-deletion-worker")
+            logger.info("Media deletion worker started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Media deletion worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker early after new tombstones are committed."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Keep draining while full batches are deleted; any failure
+                # waits for the next pass (and the rows for their backoff)
+                while await self.run_once() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Media deletion pass failed: {e}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """Process one batch of due tombstones. Returns the number of rows purged."""
+        # Imported here to avoid a cycle: S3Manager notifies this worker
+        from app.service_managers.s3_manager import S3Manager
+
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(VendorMedia.id, VendorMedia.s3_key, VendorMedia.delete_attempts)
+                .where(
+                    VendorMedia.deleted_at.isnot(None),
+                    VendorMedia.delete_attempts < self.max_attempts,
+                    or_(
+                        VendorMedia.next_delete_attempt_at.is_(None),
+                        VendorMedia.next_delete_attempt_at <= now,
+                    ),
+                )
+                .order_by(VendorMedia.deleted_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                return 0
+
+            keys = list({row.s3_key for row in rows if row.s3_key})
+            try:
+                _, failed_keys = await S3Manager.delete_objects(keys)
+            except Exception as e:
+                logger.warning(f"DeleteObjects failed for {len(keys)} keys: {e}")
+                failed_keys = keys
+
+            failed = set(failed_keys)
+            done_ids = [row.id for row in rows if row.s3_key not in failed]
+            failed_ids = [row.id for row in rows if row.s3_key in failed]
+
+            if done_ids:
+                await db.execute(delete(VendorMedia).where(VendorMedia.id.in_(done_ids)))
+            if failed_ids:
+                # Due again retry_backoff * 2**(n - 1) seconds after the n-th failure
+                backoff = self.retry_backoff * func.power(2, VendorMedia.delete_attempts)
+                await db.execute(
+                    update(VendorMedia)
+                    .where(VendorMedia.id.in_(failed_ids))
+                    .values(
+                        delete_attempts=VendorMedia.delete_attempts + 1,
+                        next_delete_attempt_at=literal(now) + func.make_interval(0, 0, 0, 0, 0, 0, backoff),
+                    )
+                )
+            await db.commit()
+
+        exhausted = sum(1 for row in rows if row.s3_key in failed and row.delete_attempts + 1 >= self.max_attempts)
+        self.deleted += len(done_ids)
+        self.failed += len(failed_ids)
+        self.exhausted += exhausted
+        if failed_ids:
+            logger.warning(f"{len(failed_ids)} media objects could not be deleted; will retry after backoff")
+        if exhausted:
+            logger.error(
+                f"{exhausted} media objects failed {self.max_attempts} delete attempts and are left in S3; "
+                f"reset vendor_media.delete_attempts to retry them"
+            )
+        return len(done_ids)
+
+    async def stats(self) -> dict:
+        """Tombstone backlog from the database plus this process's counters."""
+        now = datetime.utcnow()
+        exhausted = VendorMedia.delete_attempts >= self.max_attempts
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(
+                    func.count().filter(~exhausted).label("pending"),
+                    func.count().filter(~exhausted, VendorMedia.next_delete_attempt_at > now).label("backing_off"),
+                    func.count().filter(exhausted).label("exhausted"),
+                    func.min(case((exhausted, VendorMedia.deleted_at))).label("oldest_exhausted"),
+                ).where(VendorMedia.deleted_at.isnot(None))
+            )).one()
+        return {
+            "pending": row.pending,
+            "backing_off": row.backing_off,
+            "exhausted": row.exhausted,
+            "oldest_exhausted_deleted_at": row.oldest_exhausted,
+            "max_attempts": self.max_attempts,
+            "processed": {"deleted": self.deleted, "failed": self.failed, "exhausted": self.exhausted},
+        }
+
+
+media_deletion_worker = MediaDeletionWorker(
+    interval=settings.MEDIA_DELETE_INTERVAL,
+    batch_size=settings.MEDIA_DELETE_BATCH_SIZE,
+    max_attempts=settings.MEDIA_DELETE_MAX_ATTEMPTS,
+    retry_backoff=settings.MEDIA_DELETE_RETRY_BACKOFF,
+)
@@ -1,80 +1,230 @@
+import asyncio
 import boto3
 from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from app.config import settings
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Vendor, VendorMedia
-from sqlalchemy import select
+from sqlalchemy import select, update
+from datetime import datetime
 from fastapi import HTTPException, status
 from app.schemas import DeleteMedia
 from urllib.parse import urlparse
+from app.cache import vendor_cache, vendor_tag
+from app.service.s3_presigner import S3Presigner
+from app.service_managers.media_deletion_worker import media_deletion_worker
+
+PRESIGN_EXPIRES_IN = 3600
+
 
 class S3Manager:
 
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION,
-        config=Config(signature_version='s3v4')
-    )
+    _s3_client = None
+    _presigner = None
+    _executor = None
 
     @classmethod
-    async def generate_presigned_url(cls, file_name: str, content_type: str, file_size: int, user: object, db: AsyncSession):
-        user_id = user.user_id
-        query = select(Vendor).filter(Vendor.username == str(user_id), Vendor.is_active == True)
-        result = await db.execute(query)
-        vendor = result.scalars().first() if result else None
-        if not vendor:
-            raise HTTPException(status_code=400, detail=f"Vendor not found for user: {user_id}")
-        
-        vendor_id = vendor.id
-        # Create organized key path
-        unique_id = uuid.uuid4().hex[:8]
-        key = f"vendors/{vendor_id}/portfolio/{unique_id}_{file_name}"
+    def get_s3_client(cls):
+        """Lazily build the boto3 client (keeps it off the import path)."""
+        if cls._s3_client is None:
+            cls._s3_client = boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                aws_session_token=settings.AWS_SESSION_TOKEN,
+                region_name=settings.AWS_REGION,
+                config=Config(signature_version='s3v4')
+            )
+        return cls._s3_client
 
-        url = cls.s3_client.generate_presigned_url(
+    @classmethod
+    def get_presigner(cls):
+        """In-process SigV4 signer, available when static credentials are configured."""
+        if cls._presigner is None and settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
+            cls._presigner = S3Presigner(
+                access_key=settings.AWS_ACCESS_KEY_ID,
+                secret_key=settings.AWS_SECRET_ACCESS_KEY,
+                region=settings.AWS_REGION,
+                bucket=settings.S3_BUCKET_NAME,
+                session_token=settings.AWS_SESSION_TOKEN,
+            )
+        return cls._presigner
+
+    @classmethod
+    async def run_blocking(cls, func, *args, **kwargs):
+        """Run a blocking boto3 call on the bounded S3 executor."""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.S3_EXECUTOR_WORKERS,
+                thread_name_prefix="s3"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._executor, partial(func, *args, **kwargs))
+
+    @classmethod
+    async def presign_put(cls, key: str, content_type: str, expires_in: int = PRESIGN_EXPIRES_IN) -> str:
+        presigner = cls.get_presigner()
+        if presigner:
+            return presigner.presign_put(key, content_type, expires_in)
+
+        # Credentials come from the boto3 provider chain; sign off the event loop
+        return await cls.run_blocking(
+            cls.get_s3_client().generate_presigned_url,
             'put_object',
             Params={
                 'Bucket': settings.S3_BUCKET_NAME,
                 'Key': key,
                 'ContentType': content_type
             },
-            ExpiresIn=3600
+            ExpiresIn=expires_in
         )
 
-        public_url = f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+    @classmethod
+    async def get_active_vendor_id(cls, db: AsyncSession, user: object) -> int:
+        user_id = user.user_id
+        query = select(Vendor.id).filter(Vendor.username == str(user_id), Vendor.is_active == True)
+        result = await db.execute(query)
+        vendor_id = result.scalars().first()
+        if not vendor_id:
+            raise HTTPException(status_code=400, detail=f"Vendor not found for user: {user_id}")
+        return vendor_id
+
+    @classmethod
+    def validate_upload(cls, file_name: str, content_type: str, file_size: int) -> None:
+        if not file_name or "/" in file_name or "\\" in file_name:
+            raise HTTPException(status_code=400, detail=f"Invalid file name: {file_name!r}")
+        if not content_type.startswith(("image/", "video/")):
+            raise HTTPException(status_code=400, detail=f"Unsupported content type for {file_name}: {content_type}")
+        if file_size <= 0 or file_size > settings.S3_MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File size for {file_name} must be between 1 and {settings.S3_MAX_UPLOAD_BYTES} bytes"
+            )
+
+    @classmethod
+    def build_upload_key(cls, vendor_id: int, file_name: str) -> str:
+        # Create organized key path
+        unique_id = uuid.uuid4().hex[:8]
+        return f"vendors/{vendor_id}/portfolio/{unique_id}_{file_name}"
 
+    @classmethod
+    def build_upload_response(cls, key: str, url: str) -> dict:
+        public_url = f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
         return {
             "upload_url": url,
             "file_key": key,
             "public_url": public_url,
-            "expires_in": 3600
+            "expires_in": PRESIGN_EXPIRES_IN
         }
+
+    @classmethod
+    async def generate_presigned_url(cls, file_name: str, content_type: str, file_size: int, user: object, db: AsyncSession):
+        cls.validate_upload(file_name, content_type, file_size)
+        vendor_id = await cls.get_active_vendor_id(db, user)
+
+        key = cls.build_upload_key(vendor_id, file_name)
+        url = await cls.presign_put(key, content_type)
+        return cls.build_upload_response(key, url)
+
+    @classmethod
+    async def generate_presigned_urls(cls, files: list, user: object, db: AsyncSession):
+        """
+        Presign a batch of uploads.
+
+        The vendor is resolved once, every file is validated before anything
+        is signed, and URLs are returned in input order.
+        """
+        if len(files) > settings.S3_MAX_BATCH_FILES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.S3_MAX_BATCH_FILES} files can be uploaded per batch"
+            )
+
+        for item in files:
+            cls.validate_upload(item["file_name"], item["content_type"], item["file_size"])
+
+        vendor_id = await cls.get_active_vendor_id(db, user)
+        uploads = [
+            (cls.build_upload_key(vendor_id, item["file_name"]), item["content_type"])
+            for item in files
+        ]
+
+        presigner = cls.get_presigner()
+        if presigner:
+            urls = [presigner.presign_put(key, content_type, PRESIGN_EXPIRES_IN) for key, content_type in uploads]
+        else:
+            # One executor hop for the whole batch instead of one per file
+            urls = await cls.run_blocking(cls._boto3_presign_many, uploads)
+
+        return [cls.build_upload_response(key, url) for (key, _), url in zip(uploads, urls)]
+
+    @classmethod
+    def _boto3_presign_many(cls, uploads: list) -> list:
+        client = cls.get_s3_client()
+        return [
+            client.generate_presigned_url(
+                'put_object',
+                Params={
+                    'Bucket': settings.S3_BUCKET_NAME,
+                    'Key': key,
+                    'ContentType': content_type
+                },
+                ExpiresIn=PRESIGN_EXPIRES_IN
+            )
+            for key, content_type in uploads
+        ]
         
+    @classmethod
+    def key_from_public_url(cls, public_url: str) -> str:
+        return urlparse(public_url).path.lstrip('/')
+
     @classmethod
     async def delete_media(cls, db: AsyncSession, payload: DeleteMedia):
-        public_url = payload.public_url
-        parsed_url = urlparse(public_url)
-        s3_key = parsed_url.path.lstrip('/')
+        """
+        Tombstone a media row; the S3 object is removed by MediaDeletionWorker.
+        """
+        s3_key = cls.key_from_public_url(payload.public_url)
         
-        media_query = select(VendorMedia).filter(
-            VendorMedia.url == public_url,
+        stmt = (
+            update(VendorMedia)
+            .where(VendorMedia.s3_key == s3_key, VendorMedia.deleted_at.is_(None))
+            .values(deleted_at=datetime.utcnow())
+            .returning(VendorMedia.vendor_id)
         )
-        media_result = await db.execute(media_query)
-        media = media_result.scalars().first()
+        result = await db.execute(stmt)
+        vendor_ids = result.scalars().all()
         
-        if not media:
+        if not vendor_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Media not found or does not belong to this vendor"
             )
         
-        cls.s3_client.delete_object(
+        await db.commit()
+        await vendor_cache.invalidate(*(vendor_tag(vendor_id) for vendor_id in set(vendor_ids)))
+        media_deletion_worker.notify()
+        return {"message": "Media deleted"}
+
+    @classmethod
+    async def delete_objects(cls, keys: list):
+        """
+        Delete up to 1000 keys with a single DeleteObjects call.
+
+        Returns (deleted_keys, failed_keys).
+        """
+        if not keys:
+            return [], []
+        
+        response = await cls.run_blocking(
+            cls.get_s3_client().delete_objects,
             Bucket=settings.S3_BUCKET_NAME,
-            Key=s3_key
+            Delete={
+                "Objects": [{"Key": key} for key in keys],
+                "Quiet": True
+            }
         )
-        
-        await db.delete(media)
-        await db.commit()
-        return {"message": "Media deleted"}
\ No newline at end of file
+        failed = {error["Key"] for error in response.get("Errors", [])}
+        deleted = [key for key in keys if key not in failed]
+        return deleted, list(failed)
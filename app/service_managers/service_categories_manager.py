@@ -1,5 +1,28 @@
+"""
+Service categories, served from an in-process snapshot.
+
+The table holds a few dozen rows that change rarely, so each worker keeps an
+immutable `ServiceCategorySnapshot` (rows plus by-id and by-name indexes)
+and swaps it atomically, by rebinding one class attribute, whenever the
+table changes. Writes through this manager reload it immediately; changes
+made by other workers are picked up by polling the `service_categories` row
+of `table_versions` every SERVICE_CATEGORY_REFRESH_INTERVAL seconds.
+
+Lookups that miss the snapshot (not loaded yet, or a category created on
+another worker since the last poll) fall back to the database.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import Iterable, NamedTuple, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.etags import SERVICE_CATEGORY_TABLES, table_versions
 from app.models import ServiceCategory
 from app.schemas import (
     ServiceCategoryCreate,
@@ -7,28 +30,149 @@ from app.schemas import (
     ServiceCategoryResponse
 )
 
+logger = logging.getLogger(__name__)
+
+
+class ServiceCategoryRecord(NamedTuple):
+    id: int
+    name: str
+    short_desc: str
+    description: str
+    percentage: Optional[int]
+    meta: Optional[dict]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+SERVICE_CATEGORY_COLUMNS = tuple(getattr(ServiceCategory, field) for field in ServiceCategoryRecord._fields)
+
+
+class ServiceCategorySnapshot:
+    """Immutable view of the service_categories table at one table version."""
+
+    __slots__ = ("version", "items", "by_id", "by_name", "loaded_at")
+
+    def __init__(self, version: Optional[str], records: Iterable[ServiceCategoryRecord]):
+        self.version = version
+        self.items = tuple(records)
+        self.by_id = MappingProxyType({record.id: record for record in self.items})
+        by_name = {}
+        for record in self.items:
+            # Names are upserted, so duplicates are legacy rows; the oldest wins
+            by_name.setdefault(record.name, record)
+        self.by_name = MappingProxyType(by_name)
+        self.loaded_at = time.time() if version is not None else None
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
 
 class ServiceCategoriesManagerAsync:
-    
+
+    _snapshot = ServiceCategorySnapshot(None, ())
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def snapshot(cls) -> ServiceCategorySnapshot:
+        return cls._snapshot
+
+    @classmethod
+    async def load_snapshot(cls) -> ServiceCategorySnapshot:
+        """Read the table version, then every row, and swap in a new snapshot."""
+        async with AsyncSessionLocal() as db:
+            # Version first: a racing write then leaves an old version on new
+            # rows, which the next poll reloads, never the reverse
+            version = await table_versions(db, SERVICE_CATEGORY_TABLES)
+            result = await db.execute(select(*SERVICE_CATEGORY_COLUMNS).order_by(ServiceCategory.id))
+            records = [ServiceCategoryRecord(*row) for row in result]
+
+        cls._snapshot = ServiceCategorySnapshot(version, records)
+        logger.info(f"Service category snapshot loaded: {len(records)} categories at version {version}")
+        return cls._snapshot
+
+    @classmethod
+    async def refresh_if_changed(cls) -> bool:
+        """Reload the snapshot if the table version moved. Returns True when reloaded."""
+        if cls._snapshot.loaded:
+            async with AsyncSessionLocal() as db:
+                version = await table_versions(db, SERVICE_CATEGORY_TABLES)
+            if version == cls._snapshot.version:
+                return False
+
+        await cls.load_snapshot()
+        return True
+
+    @classmethod
+    async def _reload_after_write(cls) -> None:
+        """Swap in the committed change now; on failure the next poll picks it up."""
+        try:
+            await cls.load_snapshot()
+        except Exception as e:
+            logger.warning(f"Service category snapshot reload failed, retrying on next poll: {e}")
+
+    @classmethod
+    async def start_refresher(cls) -> None:
+        """Load the snapshot and start polling for changes made by other workers."""
+        try:
+            await cls.load_snapshot()
+        except Exception as e:
+            logger.warning(f"Service category snapshot not loaded at startup, using the database: {e}")
+
+        if cls._refresh_task is None or cls._refresh_task.done():
+            cls._refresh_task = asyncio.create_task(cls._run_refresher(), name="service-category-refresher")
+
+    @classmethod
+    async def stop_refresher(cls) -> None:
+        if cls._refresh_task is None:
+            return
+        cls._refresh_task.cancel()
+        try:
+            await cls._refresh_task
+        except asyncio.CancelledError:
+            pass
+        cls._refresh_task = None
+
+    @classmethod
+    async def _run_refresher(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.SERVICE_CATEGORY_REFRESH_INTERVAL)
+            try:
+                await cls.refresh_if_changed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Service category snapshot refresh failed: {e}")
+
+    @classmethod
+    def stats(cls) -> dict:
+        snapshot = cls._snapshot
+        return {
+            "loaded": snapshot.loaded,
+            "version": snapshot.version,
+            "categories": len(snapshot.items),
+            "age_seconds": round(time.time() - snapshot.loaded_at, 3) if snapshot.loaded else None,
+        }
+
     @classmethod
     async def create_service_category(cls, db: AsyncSession, payload: ServiceCategoryCreate):
         name = payload.name
         metadata = payload.meta
         description = payload.description
         short_desc = payload.short_desc
-        
+
         stmt = select(ServiceCategory).filter(ServiceCategory.name == name)
         result = await db.execute(stmt)
         existing_service = result.scalar_one_or_none()
-        
+
         if existing_service:
             existing_service.meta = metadata
             existing_service.description = description
             existing_service.short_desc = short_desc
             await db.commit()
-            await db.refresh(existing_service)
+            await cls._reload_after_write()
             return {"msg": "Service Category updated", "id": existing_service.id}
-        
+
         # Create new category
         new_category = ServiceCategory(
             name=name,
@@ -36,39 +180,63 @@ class ServiceCategoriesManagerAsync:
             description=description,
             meta=metadata
         )
-        
+
         db.add(new_category)
         await db.commit()
-        await db.refresh(new_category)
-        
+        await cls._reload_after_write()
+
         return {"msg": "Category successfully created", "id": new_category.id}
-    
+
     @classmethod
     async def get_service_category(cls, db: AsyncSession, category_id: int):
+        """Category by id from the snapshot, else from the database (record or ORM row)."""
+        record = cls._snapshot.by_id.get(category_id)
+        if record is not None:
+            return record
+
         stmt = select(ServiceCategory).filter(ServiceCategory.id == category_id)
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
-    
+
+    @classmethod
+    def get_service_category_by_name(cls, name: str) -> Optional[ServiceCategoryRecord]:
+        """Category by name from the snapshot only; callers fall back to a SQL filter."""
+        return cls._snapshot.by_name.get(name)
+
+    @classmethod
+    async def service_categories_version(cls, db: AsyncSession) -> str:
+        """Table version the listing is served at (the snapshot's, when loaded)."""
+        if cls._snapshot.loaded:
+            return cls._snapshot.version
+        return await table_versions(db, SERVICE_CATEGORY_TABLES)
+
     @classmethod
     async def get_all_service_categories(
-        cls, 
-        db: AsyncSession, 
-        skip: int = 0, 
+        cls,
+        db: AsyncSession,
+        skip: int = 0,
         limit: int = 100
     ):
-        stmt = select(ServiceCategory).offset(skip).limit(limit)
+        snapshot = cls._snapshot
+        if snapshot.loaded:
+            return [record._asdict() for record in snapshot.items[skip:skip + limit]]
+
+        stmt = select(*SERVICE_CATEGORY_COLUMNS).order_by(ServiceCategory.id).offset(skip).limit(limit)
         result = await db.execute(stmt)
-        return result.scalars().all()
-    
+        return [dict(row._mapping) for row in result]
+
     @classmethod
     async def delete_service_category(cls, db: AsyncSession, category_id: int):
+        # ORM delete (not the snapshot record), so its vendors are detached as before
+        stmt = select(ServiceCategory).filter(ServiceCategory.id == category_id)
+        result = await db.execute(stmt)
+        category = result.scalar_one_or_none()
 
-        category = await cls.get_service_category(db, category_id)
-        
         if not category:
             return False
-        
+
         await db.delete(category)
         await db.commit()
-        
-        return True
\ No newline at end of file
+        await cls._reload_after_write()
+
+        return True
@@ -1,11 +1,227 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import ServiceCategory, Vendor, VendorMedia
+import asyncio
+import logging
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import JSON, and_, case, select, func, literal_column, or_, true, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.config import settings
+from app.models import Budget, BudgetCategory, ServiceCategory, Vendor, VendorMedia
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import selectinload
-from app.schemas import VendorQueryParams, VendorCreate, VendorUpdate, DeleteMedia
+from app.schemas import VendorQueryParams, VendorExportParams, VendorMatchParams, VendorDiscoverParams, VendorCreate, VendorUpdate, DeleteMedia
 from app.service.auth import AuthServiceClient
+from app.service_managers.s3_manager import S3Manager
+from app.service_managers.service_categories_manager import ServiceCategoriesManagerAsync
+from app.cache import vendor_cache, vendor_tag, category_tag, ALL_VENDORS_TAG
+from app.pagination import encode_cursor, decode_cursor, keyset_condition, next_segment_condition
+from app.responses import csv_chunk, dumps, loads, ndjson_chunk
+from app.etags import VENDOR_LISTING_TABLES, make_etag, table_versions
 
+logger = logging.getLogger(__name__)
+
+
+# Sort keys accepted by get_vendors; each is backed by an (is_active, key, id) index
+VENDOR_SORT_COLUMNS = {
+    "id": Vendor.id,
+    "created_at": Vendor.created_at,
+    "lower_range": Vendor.lower_range,
+    "upper_range": Vendor.upper_range,
+}
+
+# Plain vendor columns a listing can return; internal fields (username, is_active) stay out
+VENDOR_COLUMN_FIELDS = {
+    "id": Vendor.id,
+    "name": Vendor.name,
+    "phone1": Vendor.phone1,
+    "phone2": Vendor.phone2,
+    "city": Vendor.city,
+    "district": Vendor.district,
+    "address": Vendor.address,
+    "lower_range": Vendor.lower_range,
+    "upper_range": Vendor.upper_range,
+    "email": Vendor.email,
+    "meta": Vendor.meta,
+    "created_at": Vendor.created_at,
+    "updated_at": Vendor.updated_at,
+}
+
+# Fields built from related tables; cover_image is only returned when asked for
+VENDOR_RELATED_FIELDS = ("service_category", "vendor_media", "cover_image")
+
+# Listing payload when no `fields=` is given
+DEFAULT_VENDOR_FIELDS = tuple(VENDOR_COLUMN_FIELDS) + ("service_category", "vendor_media")
+
+VENDOR_FIELD_ORDER = tuple(VENDOR_COLUMN_FIELDS) + VENDOR_RELATED_FIELDS
+
+# Flat columns of the catalog export, in output order
+VENDOR_EXPORT_COLUMNS = (
+    Vendor.id,
+    Vendor.name,
+    Vendor.phone1,
+    Vendor.phone2,
+    Vendor.email,
+    Vendor.city,
+    Vendor.district,
+    Vendor.address,
+    Vendor.lower_range,
+    Vendor.upper_range,
+    Vendor.service_category_id,
+    ServiceCategory.name.label("service_category"),
+    Vendor.is_active,
+    Vendor.meta,
+    Vendor.created_at,
+    Vendor.updated_at,
+)
+
+
+# Discovery price bands on a vendor's starting price (lower_range):
+# (key, label, lower bound inclusive, upper bound exclusive)
+VENDOR_PRICE_BANDS = (
+    ("under_50k", "Under ₹50k", None, 50000),
+    ("50k_1l", "₹50k–1L", 50000, 100000),
+    ("1l_2l", "₹1L–2L", 100000, 200000),
+    ("2l_5l", "₹2L–5L", 200000, 500000),
+    ("5l_plus", "₹5L+", 500000, None),
+)
+VENDOR_PRICE_BAND_INDEX = {band[0]: bucket for bucket, band in enumerate(VENDOR_PRICE_BANDS)}
+
+# width_bucket() over the inner bounds numbers the bands 0..4. Rendered
+# inline (not bound) so the GROUP BY expression matches the select list.
+VENDOR_PRICE_BAND_BUCKET = func.width_bucket(
+    Vendor.lower_range,
+    literal_column("ARRAY[%s]" % ",".join(str(band[2]) for band in VENDOR_PRICE_BANDS[1:])),
+)
+
+# Facets counted by discovery, keyed by the grouping() bitmask of their
+# grouping set (a bit is set for each facet column *not* grouped)
+VENDOR_FACETS = ("service_category", "city", "district", "price_band")
+VENDOR_FACET_GROUPINGS = {
+    0b0111: "service_category",
+    0b1011: "city",
+    0b1101: "district",
+    0b1110: "price_band",
+    0b1111: "total",
+}
+
+
+def parse_vendor_fields(fields: str = None) -> tuple:
+    """
+    Resolve a comma-separated `fields=` value to the listing fields to select.
+
+    `id` is always included (cursors and cache tags need it). Fields come back
+    in canonical order, so the SQL, JSON and cache key don't depend on how
+    the client ordered them.
+    """
+    if not fields:
+        return DEFAULT_VENDOR_FIELDS
+    
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(VENDOR_FIELD_ORDER)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown vendor fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return tuple(field for field in VENDOR_FIELD_ORDER if field in requested)
+
+
+# pg_trgm's default similarity_threshold, the cut-off `%` applies by itself
+PG_TRGM_SIMILARITY_THRESHOLD = 0.3
+
+
+def vendor_search_condition(term: str):
+    """
+    pg_trgm `%` match on any searchable column (served by the GIN trigram indexes).
+
+    `%` already means similarity >= pg_trgm.similarity_threshold, so the rank
+    is only re-checked when VENDOR_SEARCH_SIMILARITY_THRESHOLD is stricter;
+    that filter scores every match a second time.
+    """
+    condition = or_(
+        Vendor.name.op("%")(term),
+        Vendor.city.op("%")(term),
+        Vendor.district.op("%")(term),
+    )
+    if settings.VENDOR_SEARCH_SIMILARITY_THRESHOLD > PG_TRGM_SIMILARITY_THRESHOLD:
+        condition = and_(condition, vendor_search_rank(term) >= settings.VENDOR_SEARCH_SIMILARITY_THRESHOLD)
+    return condition
+
+
+def vendor_search_rank(term: str):
+    """Best trigram similarity across the searchable columns."""
+    return func.greatest(
+        func.similarity(Vendor.name, term),
+        func.similarity(Vendor.city, term),
+        func.similarity(Vendor.district, term),
+    )
+
+
+def vendor_listing_query(sort_column, fields: tuple = DEFAULT_VENDOR_FIELDS, join_category: bool = False):
+    """
+    Column-level SELECT for vendor listings: one round trip, no ORM entities.
+
+    Only the requested `fields` are projected, each as one result column
+    labelled with its output key. The category is a LEFT JOIN rendered with
+    json_build_object, live media are folded into a JSON array by a LATERAL
+    `json_agg` subquery (served by ix_vendor_media_vendor_id) and cover_image
+    is the first live image. Related tables are only touched when their field
+    is requested; `join_category` forces the category join for filters on it.
+    The trailing `sort_value` column carries the keyset sort key.
+    """
+    columns = []
+    media = None
+    for field in fields:
+        if field in VENDOR_COLUMN_FIELDS:
+            columns.append(VENDOR_COLUMN_FIELDS[field])
+        elif field == "service_category":
+            columns.append(
+                case(
+                    (ServiceCategory.id.is_(None), None),
+                    else_=func.json_build_object("id", ServiceCategory.id, "name", ServiceCategory.name, type_=JSON),
+                ).label("service_category")
+            )
+        elif field == "vendor_media":
+            media = (
+                select(
+                    func.coalesce(
+                        func.json_agg(
+                            aggregate_order_by(
+                                func.json_build_object(
+                                    "id", VendorMedia.id,
+                                    "media_type", VendorMedia.media_type,
+                                    "url", VendorMedia.url,
+                                ),
+                                VendorMedia.id,
+                            )
+                        ),
+                        literal_column("'[]'::json"),
+                        type_=JSON,
+                    ).label("vendor_media")
+                )
+                .where(VendorMedia.vendor_id == Vendor.id, VendorMedia.deleted_at.is_(None))
+                .lateral("media")
+            )
+            columns.append(media.c.vendor_media)
+        elif field == "cover_image":
+            columns.append(
+                select(VendorMedia.url)
+                .where(
+                    VendorMedia.vendor_id == Vendor.id,
+                    VendorMedia.deleted_at.is_(None),
+                    VendorMedia.media_type == "image",
+                )
+                .order_by(VendorMedia.id)
+                .limit(1)
+                .scalar_subquery()
+                .label("cover_image")
+            )
+    
+    query = select(*columns, sort_column.label("sort_value")).select_from(Vendor)
+    if join_category or "service_category" in fields:
+        query = query.outerjoin(ServiceCategory, Vendor.service_category_id == ServiceCategory.id)
+    if media is not None:
+        query = query.join(media, true())
+    return query.where(Vendor.is_active == True)
 
 
 class VendorManager:
@@ -25,9 +241,7 @@ class VendorManager:
         metadata = payload.meta
         service_type = int(payload.service_type)
         
-        stmt = select(ServiceCategory).filter(ServiceCategory.id == service_type)
-        service_category = await db.execute(stmt)
-        service_category = service_category.scalar_one_or_none()
+        service_category = await ServiceCategoriesManagerAsync.get_service_category(db, service_type)
         
         if not service_category:
                 raise HTTPException(
@@ -58,6 +272,7 @@ class VendorManager:
     
         await db.commit()
         await db.refresh(new_category)
+        await vendor_cache.invalidate(category_tag(service_id), ALL_VENDORS_TAG)
         
         # Return vendor data in same format as get_vendors
         return {
@@ -84,78 +299,432 @@ class VendorManager:
     # @classmethod
     # async def update_vendor_media(cls, db: AsyncSession, payload)
     
+    @classmethod
+    def canonical_params(cls, params: VendorQueryParams) -> VendorQueryParams:
+        """Params with a canonical field list, so reordered `fields=` share cache entries and ETags."""
+        if params and params.fields:
+            return params.model_copy(update={"fields": ",".join(parse_vendor_fields(params.fields))})
+        return params
+    
+    @classmethod
+    async def listing_etag(cls, db: AsyncSession, params: VendorQueryParams):
+        """(table version token, weak ETag) for a public listing; one primary-key lookup."""
+        version = await table_versions(db, VENDOR_LISTING_TABLES)
+        return version, make_etag(version, vendor_cache.make_key(cls.canonical_params(params)))
+    
+    @classmethod
+    async def get_vendors_json(
+        cls,
+        db: AsyncSession,
+        params: VendorQueryParams = None,
+        user: object = None,
+        version: str = None
+    ) -> bytes:
+        """
+        Vendor page as a serialized JSON body.
+
+        Public listings are cached as bytes, so a hit skips both the
+        database and serialization; per-user lookups always hit the DB.
+        When the caller already read the table `version` (for the ETag) it
+        is part of the cache key, so the body always matches that ETag.
+        """
+        params = cls.canonical_params(params)
+        
+        cache_key = vendor_cache.make_key(params) if params and not user else None
+        if cache_key and version:
+            cache_key = f"{cache_key}@{version}"
+        if cache_key:
+            cached = await vendor_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        page = await cls.get_vendors(db, params=params, user=user)
+        body = dumps(page)
+        
+        if cache_key:
+            tags = {vendor_tag(item["id"]) for item in page["items"]}
+            tags.update(category_tag(item["service_category"]["id"]) for item in page["items"] if item.get("service_category"))
+            if params.service_id:
+                tags.add(category_tag(params.service_id))
+            elif params.vendor_id and not (params.service_name or params.q or params.name):
+                tags.add(vendor_tag(params.vendor_id))
+            else:
+                tags.add(ALL_VENDORS_TAG)
+            await vendor_cache.set(cache_key, body, tags=tags)
+        
+        return body
+    
     @classmethod
     async def get_vendors(cls, db: AsyncSession, params: VendorQueryParams = None, user: object = None):
+        """
+        One page of active vendors with their category and live media.
+
+        Runs as a single statement over plain columns (see
+        `vendor_listing_query`), so no ORM instances are built per row.
+        """
         skip = params.skip if params else 0
         limit = params.limit if params else 1
         service_name = params.service_name if params else None
         name = params.name if params else None
         service_id = params.service_id if params else None
         vendor_id = params.vendor_id if params else None
+        sort = params.sort if params else "id"
+        order = params.order if params else "asc"
+        cursor = params.cursor if params else None
+        search = params.q.strip() if params and params.q else None
+        fields = parse_vendor_fields(params.fields if params else None)
         user_id = str(user.user_id) if user and user.user_id else None
         
-        query = select(Vendor).options(
-            selectinload(Vendor.vendor_media),
-            selectinload(Vendor.service_category)
-        )
-        
-        # Filter by service category name if provided
+        # Resolve a category name through the snapshot; unknown names (e.g. not
+        # yet polled) are matched on the joined category row instead
+        join_category = False
         if service_name:
-            stmt = select(ServiceCategory).filter(ServiceCategory.name == service_name)
-            service_category = await db.execute(stmt)
-            service_category = service_category.scalar_one_or_none()
-            service_id = service_category.id
+            service_category = ServiceCategoriesManagerAsync.get_service_category_by_name(service_name)
+            if service_category is not None:
+                category_filter = Vendor.service_category_id == service_category.id
+            else:
+                category_filter = ServiceCategory.name == service_name
+                join_category = True
+        elif service_id:
+            category_filter = Vendor.service_category_id == service_id
+        else:
+            category_filter = None
+        
+        rank = None
+        if search:
+            # Trigram search over name/city/district, combinable with the category filter
+            rank = vendor_search_rank(search)
+            conditions = [vendor_search_condition(search)]
+            if category_filter is not None:
+                conditions.append(category_filter)
+            
+        elif category_filter is not None:
+            conditions = [category_filter]
         
         # Filter by vendor name if provided
         elif name:
-            query = query.filter(Vendor.name.ilike(f"%{name}%"), Vendor.is_active == True)
-            
-        elif service_id:
-            query = query.filter(Vendor.service_category_id == service_id, Vendor.is_active == True)
+            conditions = [Vendor.name.ilike(f"%{name}%")]
             
         elif vendor_id:
-            query = query.filter(Vendor.id == vendor_id, Vendor.is_active == True)
+            conditions = [Vendor.id == vendor_id]
             
         elif user_id:
-            query = query.filter(Vendor.username == user_id, Vendor.is_active == True)
+            conditions = [Vendor.username == user_id]
         
-        query = query.offset(skip).limit(limit)
+        else:
+            conditions = []
+        
+        if rank is not None:
+            # Search results are ordered by similarity; the cursor carries the rank
+            sort, order = "relevance", "desc"
+            sort_column = rank
+        else:
+            # Keyset pagination over (sort column, id); each pair has a matching index
+            sort_column = VENDOR_SORT_COLUMNS[sort]
+        
+        query = vendor_listing_query(sort_column, fields, join_category=join_category).where(*conditions)
+        return await cls._fetch_page(db, query, fields, sort, order, sort_column, limit, cursor=cursor, skip=skip)
+    
+    @classmethod
+    async def _fetch_page(
+        cls,
+        db: AsyncSession,
+        query,
+        fields: tuple,
+        sort: str,
+        order: str,
+        sort_column,
+        limit: int,
+        cursor: str = None,
+        skip: int = 0
+    ) -> dict:
+        """
+        One keyset page of a `vendor_listing_query`: {"items", "next_cursor"}.
+
+        A cursor page reads the rest of the cursor's NULL segment with an
+        index range condition; only a page that crosses into the next
+        segment (values -> NULLs, or NULLs -> values when descending) takes
+        a second, equally indexed query for the remainder.
+        """
+        descending = order == "desc"
+        if descending:
+            query = query.order_by(sort_column.desc(), Vendor.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Vendor.id.asc())
+        
+        next_segment = None
+        page_query = query
+        if cursor:
+            state = decode_cursor(cursor, sort, order)
+            page_query = query.where(keyset_condition(sort_column, Vendor.id, state["value"], state["id"], descending))
+            next_segment = next_segment_condition(sort_column, Vendor.id, state["value"], descending)
+        elif skip:
+            page_query = query.offset(skip)
+        
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(page_query.limit(limit + 1))
+        rows = result.all()
+        
+        if next_segment is not None and len(rows) <= limit:
+            result = await db.execute(query.where(next_segment).limit(limit + 1 - len(rows)))
+            rows += result.all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, order, rows[-1].sort_value, rows[-1].id)
+        
+        # Each selected column is labelled with its output key; sort_value is last
+        vendors_with_media = [dict(zip(fields, row)) for row in rows]
+        
+        return {"items": vendors_with_media, "next_cursor": next_cursor}
+    
+    @classmethod
+    async def export_vendors(
+        cls,
+        session_factory: async_sessionmaker,
+        params: VendorExportParams
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the vendor catalog as NDJSON or CSV chunks.
+
+        Rows are read through a server-side cursor in batches of
+        VENDOR_EXPORT_BATCH_SIZE and each batch is encoded into one chunk, so
+        memory stays flat whatever the catalog size. The session is opened
+        here rather than injected, because the response body outlives the
+        request's dependencies. If the client disconnects, Starlette cancels
+        this generator and leaving the session closes the cursor.
+        """
+        query = (
+            select(*VENDOR_EXPORT_COLUMNS)
+            .select_from(Vendor)
+            .outerjoin(ServiceCategory, Vendor.service_category_id == ServiceCategory.id)
+            .where(Vendor.is_active == params.is_active)
+            .order_by(Vendor.id)
+            .execution_options(yield_per=settings.VENDOR_EXPORT_BATCH_SIZE)
+        )
+        if params.service_id:
+            query = query.where(Vendor.service_category_id == params.service_id)
+        if params.city:
+            query = query.where(func.lower(Vendor.city) == params.city.lower())
+        
+        fields = [column.key for column in VENDOR_EXPORT_COLUMNS]
+        if params.format == "csv":
+            yield csv_chunk([fields])
+        
+        exported = 0
+        try:
+            async with session_factory() as session:
+                result = await session.stream(query)
+                async for batch in result.partitions():
+                    exported += len(batch)
+                    yield ndjson_chunk(fields, batch) if params.format == "ndjson" else csv_chunk(batch)
+        except asyncio.CancelledError:
+            logger.info(f"Vendor export cancelled by client after {exported} rows")
+            raise
+        
+        logger.info(f"Vendor export finished: {exported} rows")
+    
+    @classmethod
+    def _discover_conditions(cls, params: VendorDiscoverParams) -> list:
+        """AND of every filter given; city/district match case-insensitively."""
+        conditions = []
+        if params.service_id:
+            conditions.append(Vendor.service_category_id == params.service_id)
+        if params.city:
+            conditions.append(func.lower(Vendor.city) == params.city.lower())
+        if params.district:
+            conditions.append(func.lower(Vendor.district) == params.district.lower())
+        if params.price_band:
+            _, _, lower, upper = VENDOR_PRICE_BANDS[VENDOR_PRICE_BAND_INDEX[params.price_band]]
+            if lower is not None:
+                conditions.append(Vendor.lower_range >= lower)
+            if upper is not None:
+                conditions.append(Vendor.lower_range < upper)
+        return conditions
+    
+    @classmethod
+    async def discover_etag(cls, db: AsyncSession, params: VendorDiscoverParams):
+        """(table version token, weak ETag) for a discovery response."""
+        version = await table_versions(db, VENDOR_LISTING_TABLES)
+        return version, make_etag(version, "discover", vendor_cache.make_key(cls.canonical_params(params)))
+    
+    @classmethod
+    async def vendor_facets(cls, db: AsyncSession, params: VendorDiscoverParams, version: str = None) -> dict:
+        """
+        Facet counts of the active vendors matching the discovery filters.
+
+        All four facets and the total come from one GROUPING SETS pass over
+        the matching rows. Counts are drill-down counts: each facet is
+        narrowed by every filter, its own included. The unfiltered pass is
+        an index-only scan of ix_vendors_active_facets. Results are cached
+        per filter set at the table `version`, so paging or re-sorting reuses
+        them and any catalog write starts a new entry.
+        """
+        filters = params.model_dump(include={"service_id", "city", "district", "price_band"})
+        filters["city"] = filters["city"].lower() if filters["city"] else None
+        filters["district"] = filters["district"].lower() if filters["district"] else None
+        
+        cache_key = vendor_cache.make_key({"facets": filters})
+        if version:
+            cache_key = f"{cache_key}@{version}"
+            cached = await vendor_cache.get(cache_key)
+            if cached is not None:
+                return loads(cached)
+        
+        city_key = func.lower(Vendor.city)
+        district_key = func.lower(Vendor.district)
+        query = select(
+            func.grouping(Vendor.service_category_id, city_key, district_key, VENDOR_PRICE_BAND_BUCKET).label("grouping"),
+            Vendor.service_category_id,
+            func.min(Vendor.city).label("city"),
+            func.min(Vendor.district).label("district"),
+            VENDOR_PRICE_BAND_BUCKET.label("price_band"),
+            func.count().label("count"),
+        ).where(
+            Vendor.is_active == True, *cls._discover_conditions(params)
+        ).group_by(
+            func.grouping_sets(
+                tuple_(Vendor.service_category_id),
+                tuple_(city_key),
+                tuple_(district_key),
+                tuple_(VENDOR_PRICE_BAND_BUCKET),
+                tuple_(),
+            )
+        )
         result = await db.execute(query)
-        vendors = result.scalars().all()
-        
-        vendors_with_media = []
-        for vendor in vendors:
-            vendor_dict = {
-                "id": vendor.id,
-                "name": vendor.name,
-                "phone1": vendor.phone1,
-                "phone2": vendor.phone2,
-                "city": vendor.city,
-                "district": vendor.district,
-                "address": vendor.address,
-                "lower_range": vendor.lower_range,
-                "upper_range": vendor.upper_range,
-                "email": vendor.email,
-                "meta": vendor.meta,
-                "created_at": vendor.created_at,
-                "updated_at": vendor.updated_at,
-                "service_category": {
-                    "id": vendor.service_category.id,
-                    "name": vendor.service_category.name,
-                } if vendor.service_category else None,
-                "vendor_media": [
-                    {
-                        "id": media.id,
-                        "media_type": media.media_type,
-                        "url": media.url,
-                        # "created_at": media.created_at,
-                    }
-                    for media in vendor.vendor_media
-                ]
-            }
-            vendors_with_media.append(vendor_dict)
         
-        return vendors_with_media
+        categories = ServiceCategoriesManagerAsync.snapshot().by_id
+        facets = {facet: [] for facet in VENDOR_FACETS}
+        total = 0
+        for row in result.mappings():
+            facet = VENDOR_FACET_GROUPINGS[row["grouping"]]
+            if facet == "total":
+                total = row["count"]
+            elif facet == "service_category" and row["service_category_id"] is not None:
+                category = categories.get(row["service_category_id"])
+                facets[facet].append({
+                    "id": row["service_category_id"],
+                    "name": category.name if category else None,
+                    "count": row["count"],
+                })
+            elif facet in ("city", "district") and row[facet] is not None:
+                facets[facet].append({"value": row[facet], "count": row["count"]})
+            elif facet == "price_band" and row["price_band"] is not None:
+                key, label, lower, upper = VENDOR_PRICE_BANDS[row["price_band"]]
+                facets[facet].append({"key": key, "label": label, "min": lower, "max": upper, "count": row["count"]})
+        
+        # Largest buckets first; price bands keep their natural order
+        for facet in ("service_category", "city", "district"):
+            facets[facet].sort(key=lambda bucket: -bucket["count"])
+        facets["price_band"].sort(key=lambda bucket: VENDOR_PRICE_BAND_INDEX[bucket["key"]])
+        
+        counts = {"total": total, "facets": facets}
+        if version:
+            await vendor_cache.set(cache_key, dumps(counts), tags={ALL_VENDORS_TAG})
+        return counts
+    
+    @classmethod
+    async def discover_vendors(cls, db: AsyncSession, params: VendorDiscoverParams, version: str = None) -> dict:
+        """
+        One page of active vendors matching any combination of discovery
+        filters, with the total and facet counts for the whole match.
+        """
+        params = cls.canonical_params(params)
+        fields = parse_vendor_fields(params.fields)
+        sort_column = VENDOR_SORT_COLUMNS[params.sort]
+        
+        query = vendor_listing_query(sort_column, fields).where(*cls._discover_conditions(params))
+        page = await cls._fetch_page(
+            db, query, fields, params.sort, params.order, sort_column, params.limit, cursor=params.cursor
+        )
+        counts = await cls.vendor_facets(db, params, version=version)
+        
+        facet_limit = params.facet_limit
+        return {
+            **page,
+            "total": counts["total"],
+            "facets": {facet: buckets[:facet_limit] for facet, buckets in counts["facets"].items()},
+        }
+    
+    @classmethod
+    async def _match_target(cls, db: AsyncSession, params: VendorMatchParams, user: object) -> tuple:
+        """(service_id, budget) to match: explicit params, else the user's budget category."""
+        service_id = params.service_id
+        budget = params.budget
+        
+        if params.budget_category_id is not None and (service_id is None or budget is None):
+            result = await db.execute(
+                select(BudgetCategory.budget_cat, BudgetCategory.remaining)
+                .join(Budget, Budget.id == BudgetCategory.budget_id)
+                .where(BudgetCategory.id == params.budget_category_id, Budget.user_id == int(user.user_id))
+            )
+            category = result.one_or_none()
+            if category is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Budget category with ID {params.budget_category_id} not found"
+                )
+            service_id = service_id if service_id is not None else category.budget_cat
+            budget = budget if budget is not None else category.remaining
+        
+        if service_id is None or budget is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Provide service_id and budget, or budget_category_id"
+            )
+        return service_id, budget
+    
+    @classmethod
+    async def match_vendors(cls, db: AsyncSession, params: VendorMatchParams, user: object):
+        """
+        Active vendors of a category in a city whose price band overlaps the
+        budget (anything up to `budget`), best fit first.
+
+        Category, city and the range overlap are all answered by the partial
+        GiST index ix_vendors_active_category_city_price, so only matching
+        vendors are read and sorted. Vendors priced entirely within the budget
+        come first, highest band first (the one that uses the budget best),
+        then vendors whose band runs past it, least overshoot first.
+        """
+        service_id, budget = await cls._match_target(db, params, user)
+        fields = parse_vendor_fields(params.fields)
+        response = {"service_id": service_id, "city": params.city, "budget": budget, "items": []}
+        
+        # An over-spent budget category has a negative remaining amount
+        if budget < 0:
+            return response
+        
+        # price_range is canonical [lower, upper + 1); an open-ended band has
+        # no top, so its overshoot is NULL (greatest() would skip the NULL)
+        band_top = func.upper(Vendor.price_range) - 1
+        overshoot = case(
+            (func.upper_inf(Vendor.price_range), None),
+            else_=func.greatest(band_top - budget, 0),
+        )
+        
+        query = vendor_listing_query(overshoot, fields).where(
+            Vendor.service_category_id == service_id,
+            func.lower(Vendor.city) == params.city.lower(),
+            # [, budget] is stored as [, budget + 1); no int4range holds
+            # 2**31 - 1, so capping one below it keeps the overlap and can't overflow
+            Vendor.price_range.overlaps(func.int4range(None, min(budget, 2**31 - 2), "[]")),
+        )
+        if params.district:
+            query = query.where(func.lower(Vendor.district) == params.district.lower())
+        
+        query = query.order_by(
+            overshoot.asc().nulls_last(), band_top.desc().nulls_last(), Vendor.id.asc()
+        ).limit(params.limit)
+        
+        result = await db.execute(query)
+        for row in result:
+            item = dict(zip(fields, row))
+            item["fit"] = "within" if row.sort_value == 0 else "partial"
+            item["overshoot"] = row.sort_value
+            response["items"].append(item)
+        
+        return response
     
     @classmethod
     async def fetch_vendor(cls, db: AsyncSession, name: str=None, id: str=None):
@@ -190,18 +759,25 @@ class VendorManager:
             
         await db.commit()
         await db.refresh(vendor)
+        await vendor_cache.invalidate(
+            vendor_tag(vendor.id),
+            category_tag(vendor.service_category_id),
+            ALL_VENDORS_TAG
+        )
         
         return {"msg": "Vendor successfully updated"}
     
     @classmethod
     async def vendor_deactivate(cls, db: AsyncSession, params: dict):
-        vendor = await cls.fetch_vendor(db, params)
-        if not vendor:
+        vendors = await cls.fetch_vendor(db, name=params.get("name"), id=params.get("id"))
+        if not vendors or isinstance(vendors, dict):
             return {"msg": f"No vendor found"}
         
+        vendor = vendors[0]
         vendor.is_active = False
         await db.commit()
         await db.refresh(vendor)
+        await vendor_cache.invalidate(vendor_tag(vendor.id), category_tag(vendor.service_category_id))
         
         return {"msg": "Vendor deactivated"}
     
@@ -234,12 +810,14 @@ class VendorManager:
                 vendor_id=vendor_id,
                 media_type=content_type,
                 meta=meta,
-                url=item["public_url"]
+                url=item["public_url"],
+                s3_key=S3Manager.key_from_public_url(item["public_url"])
             )
             db.add(vendor_media)
             created_media.append(vendor_media)
         
         await db.commit()
+        await vendor_cache.invalidate(vendor_tag(vendor_id))
         
         # Refresh all created media records
         for media in created_media:
@@ -1,16 +1,23 @@
 # utils/auth.py
 import base64
 import json
-from datetime import datetime, timezone
+import logging
+import time
 from functools import wraps
-from typing import Optional
-from pydantic import BaseModel
+from typing import Optional, Tuple
+from pydantic import BaseModel, ConfigDict, ValidationError
 from fastapi import Request, HTTPException, status
 import jwt
 from app.config import settings
+from app.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 class SharedContext(BaseModel):
+    # Instances are shared across requests through the decode cache
+    model_config = ConfigDict(frozen=True)
+
     user_id: int
     phone: str
     email: Optional[str] = None
@@ -39,24 +46,28 @@ def decode_jwt_payload(token: str) -> dict:
         return {}
 
 
-def is_token_expired(token: str) -> bool:
-    """Check if access token is expired."""
-    payload = decode_jwt_payload(token)
+def _is_payload_expired(payload: dict) -> bool:
+    """Check the `exp` claim of an already decoded token payload."""
     exp = payload.get('exp')
     if not exp:
         return True
-    return datetime.now(timezone.utc).timestamp() > exp
+    return time.time() > exp
 
 
-def decode_shared_context(encoded_context: str) -> Optional[SharedContext]:
-    """Decode base64 encoded shared context from header."""
-    if not encoded_context:
-        return None
-    
-    # Remove any accidental Bearer prefix
-    if encoded_context.startswith('Bearer '):
-        encoded_context = encoded_context[7:].strip()
-    
+def is_token_expired(token: str) -> bool:
+    """Check if access token is expired."""
+    return _is_payload_expired(decode_jwt_payload(token))
+
+
+# Raw X-Shared-Context header -> verified SharedContext
+_shared_context_cache = TTLCache(
+    max_entries=settings.SHARED_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl=settings.SHARED_CONTEXT_CACHE_TTL
+)
+
+
+def _verify_shared_context(encoded_context: str) -> Optional[Tuple[SharedContext, Optional[int]]]:
+    """Verify the shared context JWT and map it to a SharedContext plus its exp claim."""
     try:
         # Decode and verify JWT signature
         payload = jwt.decode(
@@ -64,27 +75,62 @@ def decode_shared_context(encoded_context: str) -> Optional[SharedContext]:
             settings.SHARED_CONTEXT_SECRET,
             algorithms="HS256"
         )
-                
-        # Verify token type and issuer for additional security
-        if payload.get('typ') != 'shared-context' or payload.get('iss') != 'sot-auth':
-            print(f"ERROR: Invalid token type or issuer. typ={payload.get('typ')}, iss={payload.get('iss')}")
-            return None
-        
-        # Map fields from auth service JWT to SharedContext
-        # Auth sends: uid, email, phone, role
-        # We need: user_id, username, email, role, is_active
-        print(f"<<<<<<<<<< {payload}")
-        shared_data = {
-            'user_id': payload.get('uid'),
-            'phone': payload.get('phone'),
-            'email': payload.get('email'),
-            'roles': payload.get('roles'),
-            'is_active': True  # Auth service doesn't send this, default to True
-        }
-        return SharedContext(**shared_data)
-    except Exception as e:
-        # Log the error for debugging (remove in production)
-        print(f"Error decoding shared context: {e}")
+    except jwt.PyJWTError as e:
+        logger.debug(f"Error decoding shared context: {e}")
+        return None
+
+    # Verify token type and issuer for additional security
+    if payload.get('typ') != 'shared-context' or payload.get('iss') != 'sot-auth':
+        logger.warning(
+            f"Invalid shared context type or issuer. typ={payload.get('typ')}, iss={payload.get('iss')}"
+        )
+        return None
+
+    # Map fields from auth service JWT to SharedContext
+    # Auth sends: uid, email, phone, role
+    # We need: user_id, username, email, role, is_active
+    shared_data = {
+        'user_id': payload.get('uid'),
+        'phone': payload.get('phone'),
+        'email': payload.get('email'),
+        'roles': payload.get('roles'),
+        'is_active': True  # Auth service doesn't send this, default to True
+    }
+    try:
+        return SharedContext(**shared_data), payload.get('exp')
+    except ValidationError as e:
+        logger.debug(f"Invalid shared context payload: {e}")
+        return None
+
+
+def decode_shared_context(encoded_context: str) -> Optional[SharedContext]:
+    """
+    Decode and verify the shared context header.
+
+    Verified contexts are memoized per raw header value until the earlier of
+    SHARED_CONTEXT_CACHE_TTL and the context's own `exp`.
+    """
+    if not encoded_context:
+        return None
+    
+    # Remove any accidental Bearer prefix
+    if encoded_context.startswith('Bearer '):
+        encoded_context = encoded_context[7:].strip()
+
+    cached = _shared_context_cache.get(encoded_context)
+    if cached is not None:
+        return cached
+
+    verified = _verify_shared_context(encoded_context)
+    if verified is None:
+        return None
+
+    context, exp = verified
+    ttl = settings.SHARED_CONTEXT_CACHE_TTL
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    _shared_context_cache.set(encoded_context, context, ttl=ttl)
+    return context
 
 
 def require_auth(func):
@@ -100,9 +146,10 @@ def require_auth(func):
             )
         
         token = auth_header[7:]
+        token_payload = decode_jwt_payload(token)
         
         # Check token expiration
-        if is_token_expired(token):
+        if _is_payload_expired(token_payload):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Access token expired"
@@ -125,7 +172,7 @@ def require_auth(func):
         
         # Attach to request state for use in route
         request.state.user = shared_context
-        request.state.token_payload = decode_jwt_payload(token)
+        request.state.token_payload = token_payload
         
         return await func(request, *args, **kwargs)
     
@@ -0,0 +1,137 @@
+"""
+Check: keyset pages over nullable sort keys stay index range scans.
+
+Seeds active vendors (under a throwaway username, removed afterwards) where
+about a tenth of lower_range, upper_range and created_at are NULL, then
+pages through the GET /vendors query path (`VendorManager.get_vendors`)
+for each nullable sort key in both orders. Every vendor must come back
+exactly once, and every statement a page issues is re-run under EXPLAIN
+ANALYZE: each scan has to be an index range scan (an Index Cond on the
+keyset columns) that discards at most MAX_FILTERED_PER_ROW rows per row it
+returns, so page N costs what page 1 does. (On the last page of a NULL run
+the planner may read the short id tail off the primary key index and filter
+it; that is bounded by the run's density, not by how deep the page is.)
+Exits non-zero on failure.
+
+Usage:
+    python -m benchmarks.bench_pagination [rows] [page_size]
+"""
+import asyncio
+import json
+import statistics
+import sys
+
+from sqlalchemy import event, text
+
+from app.database import AsyncSessionLocal, engine
+from app.schemas import VendorQueryParams
+from app.service_managers.vendor_manager import VendorManager
+
+BENCH_USERNAME = "bench-pagination"
+SORTS = ("lower_range", "upper_range", "created_at")
+MAX_FILTERED_PER_ROW = 10
+
+
+def _scans(node: dict):
+    if "Scan" in node["Node Type"]:
+        yield node
+    for child in node.get("Plans", []):
+        yield from _scans(child)
+
+
+async def _explain(conn, statement: str, parameters) -> tuple:
+    """(execution ms, scan nodes) of one captured statement."""
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+    return plan["Execution Time"], list(_scans(plan["Plan"]))
+
+
+async def check(sort: str, order: str, page_size: int, expected: int) -> bool:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((len(pages), statement, parameters))
+
+    pages, seen, cursor = [], set(), None
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                params = VendorQueryParams(sort=sort, order=order, fields="id", limit=page_size, cursor=cursor)
+                page = await VendorManager.get_vendors(db, params=params)
+                pages.append(page)
+                seen.update(item["id"] for item in page["items"])
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    returned = sum(len(page["items"]) for page in pages)
+    ok = returned == len(seen) == expected
+
+    timings, removed, bad_scans, bad_statements = [], 0, set(), 0
+    async with engine.connect() as conn:
+        for _, statement, parameters in statements:
+            ms, scans = await _explain(conn, statement, parameters)
+            timings.append(ms)
+            bad = False
+            for scan in scans:
+                filtered = scan.get("Rows Removed by Filter", 0)
+                removed = max(removed, filtered)
+                if not scan["Node Type"].startswith("Index") or "Index Cond" not in scan:
+                    bad_scans.add(scan["Node Type"])
+                    bad = True
+                elif filtered > MAX_FILTERED_PER_ROW * max(scan["Actual Rows"], 1):
+                    bad_scans.add(f"{scan['Node Type']} + Filter")
+                    bad = True
+            bad_statements += bad
+    ok = ok and not bad_scans
+
+    print(
+        f"  {sort:11s} {order:4s}  {len(pages):4d} pages {len(statements):4d} stmts  "
+        f"page 1 {timings[0]:6.2f} ms  median {statistics.median(timings):6.2f} ms  max {max(timings):6.2f} ms  "
+        f"removed by filter {removed:6d}  {'OK' if ok else 'FAIL'}"
+        + (f"  rows {returned}/{len(seen)}/{expected}" if returned != expected else "")
+        + (f"  {bad_statements} stmts with {sorted(bad_scans)}" if bad_scans else "")
+    )
+    return ok
+
+
+async def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("""
+            INSERT INTO vendors (name, username, city, is_active, lower_range, upper_range, created_at, updated_at)
+            SELECT 'Bench vendor ' || g, :username, 'Jaipur', true,
+                   CASE WHEN g % 10 = 0 THEN NULL ELSE (g * 7919) % 500000 END,
+                   CASE WHEN g % 10 = 1 THEN NULL ELSE (g * 7919) % 500000 + 50000 END,
+                   CASE WHEN g % 10 = 2 THEN NULL ELSE now() - g * interval '1 minute' END,
+                   now()
+            FROM generate_series(1, :rows) AS g
+        """), {"username": BENCH_USERNAME, "rows": rows})
+        await db.commit()
+        await db.execute(text("ANALYZE vendors"))
+        await db.commit()
+        expected = (await db.execute(text("SELECT count(*) FROM vendors WHERE is_active"))).scalar()
+
+    try:
+        print(f"{expected} active vendors, {page_size} per page\n")
+        results = [await check(sort, order, page_size, expected) for sort in SORTS for order in ("asc", "desc")]
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM vendors WHERE username = :username"), {"username": BENCH_USERNAME})
+            await db.commit()
+        await engine.dispose()
+
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: S3 presigned PUT URLs per second on a single core.
+
+Compares botocore's `generate_presigned_url` (the previous code path) with the
+in-process SigV4 signer used by S3Manager.
+
+Usage:
+    python -m benchmarks.bench_presign [iterations]
+"""
+import sys
+import time
+import uuid
+
+from app.service.s3_presigner import S3Presigner
+
+ACCESS_KEY = "AKIDEXAMPLE"
+SECRET_KEY = "wJalrXUtnFEMI/K7MDENG/bPxRfiCYEXAMPLEKEY"
+REGION = "ap-south-1"
+BUCKET = "bench-bucket"
+
+
+def _keys(n: int):
+    return [f"vendors/42/portfolio/{uuid.uuid4().hex[:8]}_photo_{i}.jpg" for i in range(n)]
+
+
+def bench_boto3(keys) -> float:
+    import boto3
+    from botocore.config import Config
+
+    client = boto3.client(
+        "s3",
+        aws_access_key_id=ACCESS_KEY,
+        aws_secret_access_key=SECRET_KEY,
+        region_name=REGION,
+        config=Config(signature_version="s3v4"),
+    )
+    start = time.perf_counter()
+    for key in keys:
+        client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": BUCKET, "Key": key, "ContentType": "image/jpeg"},
+            ExpiresIn=3600,
+        )
+    return time.perf_counter() - start
+
+
+def bench_sigv4(keys) -> float:
+    presigner = S3Presigner(ACCESS_KEY, SECRET_KEY, REGION, BUCKET)
+    start = time.perf_counter()
+    for key in keys:
+        presigner.presign_put(key, "image/jpeg", 3600)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    keys = _keys(iterations)
+
+    results = {}
+    try:
+        results["boto3 generate_presigned_url"] = bench_boto3(keys)
+    except ImportError:
+        print("boto3 not installed; skipping baseline")
+    results["in-process SigV4 signer"] = bench_sigv4(keys)
+
+    for name, elapsed in results.items():
+        print(f"{name:32s} {iterations / elapsed:12,.0f} presigns/s  ({elapsed * 1e6 / iterations:.1f} us each)")
+
+
+if __name__ == "__main__":
+    main()
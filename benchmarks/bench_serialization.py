@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: serialization time for one 100-vendor listing page.
+
+Compares the previous path (FastAPI's `jsonable_encoder` + stdlib `json` on
+the hand-built dicts), the `response_model` path (validate into VendorPage,
+dump, orjson) and the direct row-to-bytes path used by GET /vendors
+(`app.responses.dumps`). Cache hits return the stored bytes and skip
+serialization entirely.
+
+Usage:
+    python -m benchmarks.bench_serialization [iterations] [media_per_vendor]
+"""
+import json
+import sys
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.responses import dumps
+from app.schemas import VendorPage
+
+PAGE_SIZE = 100
+
+
+def _page(media_per_vendor: int) -> dict:
+    now = datetime.utcnow()
+    items = []
+    for i in range(PAGE_SIZE):
+        items.append({
+            "id": i,
+            "name": f"Royal Caterers {i}",
+            "phone1": "9876543210",
+            "phone2": None,
+            "city": "Jaipur",
+            "district": "Central",
+            "address": "12 MI Road, near Panch Batti",
+            "lower_range": 50000,
+            "upper_range": 250000,
+            "email": f"vendor{i}@example.com",
+            "meta": {"rating": 4.6, "tags": ["veg", "live counters"], "years": 12},
+            "created_at": now,
+            "updated_at": now,
+            "service_category": {"id": 3, "name": "Catering"},
+            "vendor_media": [
+                {
+                    "id": i * 100 + j,
+                    "media_type": "image",
+                    "url": f"https://bucket.s3.ap-south-1.amazonaws.com/vendors/{i}/portfolio/ab12cd34_{j}.jpg",
+                }
+                for j in range(media_per_vendor)
+            ],
+        })
+    return {"items": items, "next_cursor": "eyJzIjoiaWQiLCJvIjoiYXNjIiwidiI6OTksImlkIjo5OX0"}
+
+
+def _time(fn, iterations: int):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = fn()
+    return (time.perf_counter() - start) / iterations, len(body)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    media = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    page = _page(media)
+
+    paths = [
+        ("jsonable_encoder + json (before)", lambda: json.dumps(jsonable_encoder(page)).encode()),
+        ("response_model VendorPage", lambda: dumps(VendorPage.model_validate(page).model_dump(mode="json"))),
+        ("orjson row-to-bytes (after)", lambda: dumps(page)),
+    ]
+
+    print(f"{PAGE_SIZE} vendors x {media} media, {iterations} iterations\n")
+    baseline = None
+    for label, fn in paths:
+        seconds, size = _time(fn, iterations)
+        baseline = baseline or seconds
+        print(f"  {label:34s} {seconds * 1000:8.3f} ms/page  {size:7d} bytes  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
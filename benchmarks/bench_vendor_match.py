@@ -0,0 +1,137 @@
+"""
+Check: budget matching is answered by the category/city/price GiST index.
+
+Seeds active and inactive vendors (under throwaway service categories,
+removed afterwards) spread over categories, cities and price bands, then
+runs GET /vendors/match (`VendorManager.match_vendors`) for a range of
+budgets. Each statement it issues is re-run under EXPLAIN ANALYZE and has
+to read vendors through an index scan on ix_vendors_active_category_city_price
+whose Index Cond covers category, city and the price range overlap. Needs
+btree_gist (migration 0005). Exits non-zero on failure.
+
+Usage:
+    python -m benchmarks.bench_vendor_match [rows]
+"""
+import asyncio
+import json
+import sys
+
+from sqlalchemy import event, text
+
+from app.database import AsyncSessionLocal, engine
+from app.schemas import VendorMatchParams
+from app.service_managers.vendor_manager import VendorManager
+
+BENCH_CATEGORY_PREFIX = "bench-match-"
+CATEGORIES = 20
+CITIES = ["Jaipur", "Delhi", "Mumbai", "Pune", "Udaipur", "Goa", "Kochi", "Agra", "Surat", "Indore"]
+BUDGETS = [0, 40000, 150000, 400000, 2**31 - 1]
+INDEX = "ix_vendors_active_category_city_price"
+
+
+def _nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def _explain(conn, statement: str, parameters) -> dict:
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def _uses_index(plan: dict) -> bool:
+    """Every vendors scan is an index scan on INDEX covering category, city and price_range."""
+    scans = [
+        node for node in _nodes(plan["Plan"])
+        if node["Node Type"].endswith("Scan") and node["Node Type"] != "Bitmap Heap Scan"
+    ]
+    return bool(scans) and all(
+        node.get("Index Name") == INDEX
+        and all(part in node.get("Index Cond", "") for part in ("service_category_id", "lower", "price_range &&"))
+        for node in scans
+    )
+
+
+async def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("""
+            INSERT INTO service_categories (name, short_desc, description)
+            SELECT :prefix || g, 'Benchmark', 'Benchmark category'
+            FROM generate_series(1, :categories) AS g
+            RETURNING id
+        """), {"prefix": BENCH_CATEGORY_PREFIX, "categories": CATEGORIES})
+        category_ids = sorted(result.scalars().all())
+        await db.execute(text("""
+            INSERT INTO vendors (name, city, district, is_active, service_category_id, lower_range, upper_range, created_at, updated_at)
+            SELECT 'Bench vendor ' || g,
+                   (CAST(:cities AS text[]))[1 + g % :city_count], 'Central',
+                   g % 10 <> 0,
+                   (CAST(:category_ids AS int[]))[1 + g % :category_count],
+                   CASE WHEN g % 17 = 0 THEN NULL ELSE (g * 7919) % 500000 END,
+                   CASE WHEN g % 13 = 0 THEN NULL ELSE (g * 7919) % 500000 + (g % 9) * 25000 END,
+                   now(), now()
+            FROM generate_series(1, :rows) AS g
+        """), {
+            "cities": CITIES, "city_count": len(CITIES),
+            "category_ids": category_ids, "category_count": len(category_ids),
+            "rows": rows,
+        })
+        await db.commit()
+        await db.execute(text("ANALYZE vendors"))
+        await db.commit()
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    failed = 0
+    try:
+        print(f"{rows} vendors, {CATEGORIES} categories, {len(CITIES)} cities\n")
+        for budget in BUDGETS:
+            # Vendor g has category g % CATEGORIES and city g % len(CITIES)
+            for service_id, city in ((category_ids[1], CITIES[1]), (category_ids[-1], CITIES[-1].lower())):
+                statements.clear()
+                event.listen(engine.sync_engine, "before_cursor_execute", capture)
+                try:
+                    async with AsyncSessionLocal() as db:
+                        params = VendorMatchParams(service_id=service_id, city=city, budget=budget, fields="id")
+                        response = await VendorManager.match_vendors(db, params, user=None)
+                finally:
+                    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+                async with engine.connect() as conn:
+                    for statement, parameters in statements:
+                        plan = await _explain(conn, statement, parameters)
+                        ok = _uses_index(plan)
+                        failed += not ok
+                        chain = " -> ".join(
+                            node["Node Type"] + (f" on {node['Index Name']}" if "Index Name" in node else "")
+                            for node in _nodes(plan["Plan"])
+                        )
+                        print(
+                            f"  budget {budget:>10d} {city:7s}  {len(response['items']):3d} items  "
+                            f"{plan['Execution Time']:7.2f} ms  {chain}  {'OK' if ok else 'FAIL'}"
+                        )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("DELETE FROM vendors WHERE service_category_id = ANY(:category_ids)"),
+                {"category_ids": category_ids},
+            )
+            await db.execute(text("DELETE FROM service_categories WHERE id = ANY(:category_ids)"), {"category_ids": category_ids})
+            await db.commit()
+        await engine.dispose()
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark: vendor name search, ILIKE seq scan vs trigram GIN index.
+
+Seeds a throwaway `bench_search` schema in DATABASE_URL with a synthetic
+catalog, then prints EXPLAIN ANALYZE plans and timings for the old
+`name ILIKE '%term%'` filter and for the ranked trigram search used by
+GET /vendors?q=..., first without indexes and then with the GIN indexes.
+Exits non-zero unless every indexed ranked search is a BitmapOr over all
+three trigram indexes. The schema is dropped afterwards; the application
+tables are never touched.
+
+Usage:
+    python -m benchmarks.bench_vendor_search [rows]
+"""
+import asyncio
+import json
+import sys
+
+from sqlalchemy import text
+
+from app.database import engine
+
+SCHEMA = "bench_search"
+TERMS = ["shutterbug", "jaipur", "royal caterers", "lotus films 123457"]
+TRGM_INDEXES = {f"vendors_{column}_idx" for column in ("name", "city", "district")}
+
+
+async def _explain(conn, sql: str, params: dict) -> list:
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+
+    nodes = []
+
+    def walk(node):
+        label = node["Node Type"]
+        if "Index Name" in node:
+            label += f" on {node['Index Name']}"
+        nodes.append(label)
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    print(f"    {plan['Execution Time']:9.2f} ms  {' -> '.join(nodes)}")
+    return nodes
+
+
+def _uses_bitmap_or(nodes: list) -> bool:
+    """BitmapOr with one Bitmap Index Scan per trigram index, no Seq Scan."""
+    scanned = {node.split(" on ")[1] for node in nodes if node.startswith("Bitmap Index Scan on ")}
+    return "BitmapOr" in nodes and scanned == TRGM_INDEXES and "Seq Scan" not in nodes
+
+
+async def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"""
+            CREATE TABLE {SCHEMA}.vendors AS
+            SELECT g AS id,
+                   (ARRAY['Royal','Shutterbug','Golden','Lotus','Dream','Star'])[1 + g % 6]
+                       || ' ' || (ARRAY['Caterers','Studios','Decor','Events','Films','Bands'])[1 + (g / 6) % 6]
+                       || ' ' || g AS name,
+                   (ARRAY['Jaipur','Delhi','Mumbai','Pune','Udaipur','Goa','Kochi'])[1 + g % 7] AS city,
+                   (ARRAY['Central','North','South','East','West'])[1 + g % 5] AS district,
+                   (g % 20 <> 0) AS is_active
+            FROM generate_series(1, :rows) AS g
+        """), {"rows": rows})
+        await conn.execute(text(f"ANALYZE {SCHEMA}.vendors"))
+
+        old_sql = f"SELECT id FROM {SCHEMA}.vendors WHERE name ILIKE :pattern AND is_active LIMIT 100"
+        # Same shape as vendor_search_condition / vendor_search_rank at the default threshold
+        new_sql = f"""
+            SELECT id, greatest(similarity(name, :term), similarity(city, :term), similarity(district, :term)) AS rank
+            FROM {SCHEMA}.vendors
+            WHERE (name % :term OR city % :term OR district % :term) AND is_active
+            ORDER BY rank DESC, id DESC
+            LIMIT 100
+        """
+
+        print(f"{rows} vendors\n\nBefore (no index):")
+        for term in TERMS:
+            print(f"  ILIKE {term!r}")
+            await _explain(conn, old_sql, {"pattern": f"%{term}%"})
+            print(f"  ranked search {term!r}")
+            await _explain(conn, new_sql, {"term": term})
+
+        for column in ("name", "city", "district"):
+            await conn.execute(text(
+                f"CREATE INDEX ON {SCHEMA}.vendors USING gin ({column} gin_trgm_ops)"
+            ))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.vendors"))
+
+        print("\nAfter (GIN trigram indexes):")
+        failed = []
+        for term in TERMS:
+            print(f"  ILIKE {term!r}")
+            await _explain(conn, old_sql, {"pattern": f"%{term}%"})
+            print(f"  ranked search {term!r}")
+            if not _uses_bitmap_or(await _explain(conn, new_sql, {"term": term})):
+                failed.append(term)
+
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    await engine.dispose()
+
+    if failed:
+        print(f"\nRanked search not a BitmapOr over {sorted(TRGM_INDEXES)}: {failed}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark: /weddings/{id} throughput, threadpool `def` handler vs async handler.
+
+The "threadpool" app mirrors the previous router: a plain `def` endpoint
+(run by Starlette in the anyio threadpool, 40 threads by default) that loads
+the wedding with a sync session and checks ownership in Python. The "async"
+app mounts the real weddings router, which awaits a single
+`WHERE id = :id AND user_id = :uid` query. Both use the same pool limits.
+
+Requests go through httpx's ASGI transport, so the numbers measure the
+handler + database path without socket overhead. A few weddings are seeded
+for a throwaway user id and removed afterwards.
+
+Usage:
+    python -m benchmarks.bench_weddings [requests] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.auth import get_user_id
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models import Budget
+from app.routers import weddings
+
+BENCH_USER_ID = -4242
+WEDDINGS = 20
+
+
+def build_threadpool_app() -> FastAPI:
+    sync_engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+    SessionLocal = sessionmaker(sync_engine)
+
+    def get_sync_db():
+        with SessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.get("/api/v1/weddings/{wedding_id}")
+    def get_wedding(wedding_id: int, db: Session = Depends(get_sync_db), user_id: int = Depends(get_user_id)):
+        wedding = db.query(Budget).filter(Budget.id == wedding_id).first()
+        if not wedding:
+            raise HTTPException(status_code=404, detail="Wedding not found")
+        if wedding.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this wedding")
+        return {"id": wedding.id, "user_id": wedding.user_id, "name": wedding.name}
+
+    app.dependency_overrides[get_user_id] = lambda: BENCH_USER_ID
+    app.state.sync_engine = sync_engine
+    return app
+
+
+def build_async_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(weddings.router, prefix="/api/v1")
+    app.dependency_overrides[get_user_id] = lambda: BENCH_USER_ID
+    return app
+
+
+async def drive(app: FastAPI, ids: list, requests: int, concurrency: int) -> None:
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(ids[i % len(ids)])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                wedding_id = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(f"/api/v1/weddings/{wedding_id}")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        # Warm up pools before timing
+        await asyncio.gather(*(client.get(f"/api/v1/weddings/{ids[0]}") for _ in range(concurrency)))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"  {requests / elapsed:8.0f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms"
+    )
+
+
+async def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    async with AsyncSessionLocal() as db:
+        rows = [{"user_id": BENCH_USER_ID, "name": f"bench wedding {i}"} for i in range(WEDDINGS)]
+        created = await weddings.wedding_core_crud.bulk_create(db, rows)
+        ids = [wedding.id for wedding in created]
+        await db.commit()
+
+    threadpool_app = build_threadpool_app()
+    try:
+        print(f"{requests} requests, concurrency {concurrency}\n")
+        print("threadpool (def handler, sync session):")
+        await drive(threadpool_app, ids, requests, concurrency)
+        print("async (async handler, AsyncSession):")
+        await drive(build_async_app(), ids, requests, concurrency)
+    finally:
+        threadpool_app.state.sync_engine.dispose()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Budget).where(Budget.user_id == BENCH_USER_ID))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""initial schema
+
+Baseline matching the tables previously created by Base.metadata.create_all.
+Databases created that way should be stamped with `alembic stamp 0001`
+before running `alembic upgrade head`.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-16 22:38:10.295010
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('budget',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('total_budget', sa.Integer(), nullable=True),
+    sa.Column('spent_budget', sa.Integer(), nullable=True),
+    sa.Column('meta', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_budget_id'), 'budget', ['id'], unique=False)
+    op.create_index(op.f('ix_budget_user_id'), 'budget', ['user_id'], unique=False)
+    op.create_table('service_categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('short_desc', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('percentage', sa.Integer(), nullable=True),
+    sa.Column('meta', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_service_categories_id'), 'service_categories', ['id'], unique=False)
+    op.create_table('budget_categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('budget_id', sa.Integer(), nullable=False),
+    sa.Column('budget_cat', sa.Integer(), nullable=True),
+    sa.Column('budget_amt', sa.Integer(), nullable=True),
+    sa.Column('actual_cost', sa.Integer(), nullable=True),
+    sa.Column('remaining', sa.Integer(), nullable=True),
+    sa.Column('meta', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['budget_id'], ['budget.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_budget_categories_budget_id'), 'budget_categories', ['budget_id'], unique=False)
+    op.create_index(op.f('ix_budget_categories_id'), 'budget_categories', ['id'], unique=False)
+    op.create_table('vendors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('phone1', sa.String(length=20), nullable=True),
+    sa.Column('phone2', sa.String(length=20), nullable=True),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('district', sa.String(), nullable=True),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('lower_range', sa.Integer(), nullable=True),
+    sa.Column('upper_range', sa.Integer(), nullable=True),
+    sa.Column('meta', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('service_category_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['service_category_id'], ['service_categories.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendors_id'), 'vendors', ['id'], unique=False)
+    op.create_index(op.f('ix_vendors_service_category_id'), 'vendors', ['service_category_id'], unique=False)
+    op.create_table('budget_vendor_map',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('budget_category_id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('budget_id', sa.Integer(), nullable=False),
+    sa.Column('meta', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['budget_category_id'], ['budget_categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['budget_id'], ['budget.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_budget_vendor_map_budget_category_id'), 'budget_vendor_map', ['budget_category_id'], unique=False)
+    op.create_index(op.f('ix_budget_vendor_map_budget_id'), 'budget_vendor_map', ['budget_id'], unique=False)
+    op.create_index(op.f('ix_budget_vendor_map_id'), 'budget_vendor_map', ['id'], unique=False)
+    op.create_index(op.f('ix_budget_vendor_map_vendor_id'), 'budget_vendor_map', ['vendor_id'], unique=False)
+    op.create_table('vendor_media',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('vendor_id', sa.Integer(), nullable=False),
+    sa.Column('media_type', sa.String(length=50), nullable=True),
+    sa.Column('meta', sa.JSON(), nullable=True),
+    sa.Column('url', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendor_media_id'), 'vendor_media', ['id'], unique=False)
+    op.create_index(op.f('ix_vendor_media_vendor_id'), 'vendor_media', ['vendor_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_vendor_media_vendor_id'), table_name='vendor_media')
+    op.drop_index(op.f('ix_vendor_media_id'), table_name='vendor_media')
+    op.drop_table('vendor_media')
+    op.drop_index(op.f('ix_budget_vendor_map_vendor_id'), table_name='budget_vendor_map')
+    op.drop_index(op.f('ix_budget_vendor_map_id'), table_name='budget_vendor_map')
+    op.drop_index(op.f('ix_budget_vendor_map_budget_id'), table_name='budget_vendor_map')
+    op.drop_index(op.f('ix_budget_vendor_map_budget_category_id'), table_name='budget_vendor_map')
+    op.drop_table('budget_vendor_map')
+    op.drop_index(op.f('ix_vendors_service_category_id'), table_name='vendors')
+    op.drop_index(op.f('ix_vendors_id'), table_name='vendors')
+    op.drop_table('vendors')
+    op.drop_index(op.f('ix_budget_categories_id'), table_name='budget_categories')
+    op.drop_index(op.f('ix_budget_categories_budget_id'), table_name='budget_categories')
+    op.drop_table('budget_categories')
+    op.drop_index(op.f('ix_service_categories_id'), table_name='service_categories')
+    op.drop_table('service_categories')
+    op.drop_index(op.f('ix_budget_user_id'), table_name='budget')
+    op.drop_index(op.f('ix_budget_id'), table_name='budget')
+    op.drop_table('budget')
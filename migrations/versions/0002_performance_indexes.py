@@ -0,0 +1,112 @@
+"""performance indexes
+
+Columns and indexes backing the vendor cache/search/pagination work, media
+tombstones and the budget category upsert.
+
+The upgrade stops (before changing anything) if budget_categories already
+has duplicate (budget_id, budget_cat) rows, listing them; merge or delete
+them and re-run. The vendors and vendor_media indexes are built
+CONCURRENTLY outside the migration transaction, so writes to those tables
+keep flowing while they build. If one of those builds fails, drop the
+INVALID index it leaves behind before retrying.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 22:38:14.609020
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Refuses to build the upsert target over duplicates instead of picking a survivor
+CHECK_DUPLICATE_BUDGET_CATEGORIES = """
+    DO $$
+    DECLARE
+        total bigint;
+        listed text;
+    BEGIN
+        SELECT max(pairs), string_agg(format('budget_id=%s budget_cat=%s ids=%s', budget_id, budget_cat, ids), '; ')
+        INTO total, listed
+        FROM (
+            SELECT budget_id, budget_cat, array_agg(id ORDER BY id) AS ids,
+                   row_number() OVER (ORDER BY budget_id, budget_cat) AS n,
+                   count(*) OVER () AS pairs
+            FROM budget_categories
+            GROUP BY budget_id, budget_cat
+            HAVING count(*) > 1
+        ) AS duplicates
+        WHERE n <= 50;
+        IF total > 0 THEN
+            RAISE EXCEPTION 'budget_categories has % duplicated (budget_id, budget_cat) pairs; merge or delete them, then re-run the migration', total
+                USING DETAIL = 'First 50: ' || listed;
+        END IF;
+    END $$
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Budget category upsert target
+    op.execute(CHECK_DUPLICATE_BUDGET_CATEGORIES)
+    op.create_index('uq_budget_categories_budget_cat', 'budget_categories', ['budget_id', 'budget_cat'], unique=True)
+
+    # Lookup by category name
+    op.create_index(op.f('ix_service_categories_name'), 'service_categories', ['name'], unique=False)
+
+    # Media tombstones
+    op.add_column('vendor_media', sa.Column('s3_key', sa.String(length=1024), nullable=True))
+    op.add_column('vendor_media', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('vendor_media', sa.Column('delete_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE vendor_media "
+        "SET s3_key = regexp_replace(split_part(url, '?', 1), '^[a-zA-Z]+://[^/]+/', '') "
+        "WHERE s3_key IS NULL AND url IS NOT NULL"
+    )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; this commits the work above first
+    with op.get_context().autocommit_block():
+        # Media key lookup and the deletion worker's queue
+        op.create_index(op.f('ix_vendor_media_s3_key'), 'vendor_media', ['s3_key'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_vendor_media_pending_delete', 'vendor_media', ['deleted_at'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'), postgresql_concurrently=True)
+
+        # Lookup by vendor owner
+        op.create_index(op.f('ix_vendors_username'), 'vendors', ['username'], unique=False, postgresql_concurrently=True)
+
+        # Keyset pagination, one per vendor sort key
+        op.create_index('ix_vendors_active_id', 'vendors', ['is_active', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_vendors_active_created_at', 'vendors', ['is_active', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_vendors_active_lower_range', 'vendors', ['is_active', 'lower_range', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_vendors_active_upper_range', 'vendors', ['is_active', 'upper_range', 'id'], unique=False, postgresql_concurrently=True)
+
+        # Trigram search
+        op.create_index('ix_vendors_name_trgm', 'vendors', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_vendors_city_trgm', 'vendors', ['city'], unique=False, postgresql_using='gin', postgresql_ops={'city': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_vendors_district_trgm', 'vendors', ['district'], unique=False, postgresql_using='gin', postgresql_ops={'district': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendors_district_trgm', table_name='vendors')
+    op.drop_index('ix_vendors_city_trgm', table_name='vendors')
+    op.drop_index('ix_vendors_name_trgm', table_name='vendors')
+    op.drop_index('ix_vendors_active_upper_range', table_name='vendors')
+    op.drop_index('ix_vendors_active_lower_range', table_name='vendors')
+    op.drop_index('ix_vendors_active_created_at', table_name='vendors')
+    op.drop_index('ix_vendors_active_id', table_name='vendors')
+    op.drop_index('ix_vendor_media_pending_delete', table_name='vendor_media')
+    op.drop_index(op.f('ix_vendor_media_s3_key'), table_name='vendor_media')
+    op.drop_column('vendor_media', 'delete_attempts')
+    op.drop_column('vendor_media', 'deleted_at')
+    op.drop_column('vendor_media', 's3_key')
+    op.drop_index(op.f('ix_vendors_username'), table_name='vendors')
+    op.drop_index(op.f('ix_service_categories_name'), table_name='service_categories')
+    op.drop_index('uq_budget_categories_budget_cat', table_name='budget_categories')
@@ -0,0 +1,113 @@
+"""budget aggregates
+
+Server-owned budget totals:
+- budget_categories.remaining becomes a stored generated column
+  (budget_amt - actual_cost).
+- budget.spent_budget is kept equal to the sum of its categories'
+  actual_cost by statement-level triggers. They apply one summed delta per
+  budget from the statement's transition tables instead of re-summing.
+- Existing rows are reconciled once.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 23:24:08.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REMAINING_EXPRESSION = 'COALESCE(budget_amt, 0) - COALESCE(actual_cost, 0)'
+
+# Same statement as BudgetManager.reconcile_spent_budgets
+RECONCILE_SPENT_BUDGETS = """
+    UPDATE budget SET spent_budget = totals.spent
+    FROM (
+        SELECT budget.id, COALESCE(SUM(budget_categories.actual_cost), 0) AS spent
+        FROM budget LEFT JOIN budget_categories ON budget_categories.budget_id = budget.id
+        GROUP BY budget.id
+    ) AS totals
+    WHERE budget.id = totals.id AND budget.spent_budget IS DISTINCT FROM totals.spent
+"""
+
+
+def upgrade() -> None:
+    op.drop_column('budget_categories', 'remaining')
+    op.add_column(
+        'budget_categories',
+        sa.Column('remaining', sa.Integer(), sa.Computed(REMAINING_EXPRESSION, persisted=True), nullable=True)
+    )
+
+    # Transition tables are only referenced in the branch for their event,
+    # and PL/pgSQL plans statements lazily, so one function serves all three
+    op.execute(
+        """
+        CREATE FUNCTION budget_categories_spent_delta() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE budget SET spent_budget = COALESCE(budget.spent_budget, 0) + delta.amount
+                FROM (
+                    SELECT budget_id, SUM(COALESCE(actual_cost, 0)) AS amount
+                    FROM new_rows GROUP BY budget_id
+                ) AS delta
+                WHERE budget.id = delta.budget_id AND delta.amount <> 0;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE budget SET spent_budget = COALESCE(budget.spent_budget, 0) - delta.amount
+                FROM (
+                    SELECT budget_id, SUM(COALESCE(actual_cost, 0)) AS amount
+                    FROM old_rows GROUP BY budget_id
+                ) AS delta
+                WHERE budget.id = delta.budget_id AND delta.amount <> 0;
+            ELSE
+                UPDATE budget SET spent_budget = COALESCE(budget.spent_budget, 0) + delta.amount
+                FROM (
+                    SELECT budget_id, SUM(amount) AS amount
+                    FROM (
+                        SELECT budget_id, COALESCE(actual_cost, 0) AS amount FROM new_rows
+                        UNION ALL
+                        SELECT budget_id, -COALESCE(actual_cost, 0) FROM old_rows
+                    ) AS changes
+                    GROUP BY budget_id
+                ) AS delta
+                WHERE budget.id = delta.budget_id AND delta.amount <> 0;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER budget_categories_spent_insert AFTER INSERT ON budget_categories "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION budget_categories_spent_delta()"
+    )
+    op.execute(
+        "CREATE TRIGGER budget_categories_spent_update AFTER UPDATE ON budget_categories "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION budget_categories_spent_delta()"
+    )
+    op.execute(
+        "CREATE TRIGGER budget_categories_spent_delete AFTER DELETE ON budget_categories "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION budget_categories_spent_delta()"
+    )
+
+    op.execute(RECONCILE_SPENT_BUDGETS)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS budget_categories_spent_delete ON budget_categories")
+    op.execute("DROP TRIGGER IF EXISTS budget_categories_spent_update ON budget_categories")
+    op.execute("DROP TRIGGER IF EXISTS budget_categories_spent_insert ON budget_categories")
+    op.execute("DROP FUNCTION IF EXISTS budget_categories_spent_delta()")
+    op.drop_column('budget_categories', 'remaining')
+    op.add_column('budget_categories', sa.Column('remaining', sa.Integer(), nullable=True))
+    op.execute(f"UPDATE budget_categories SET remaining = {REMAINING_EXPRESSION}")
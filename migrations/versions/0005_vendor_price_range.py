@@ -0,0 +1,58 @@
+"""vendor price range
+
+Budget matching for vendors:
+- vendors.price_range is a stored generated int4range over
+  [lower_range, upper_range] (bounds swapped if entered reversed, NULL when
+  neither is set).
+- ix_vendors_active_category_city_price is a partial GiST index on
+  (service_category_id, lower(city), price_range) for active vendors. The
+  scalar columns need btree_gist, so category, city and the range overlap
+  are all answered by one index scan.
+
+Adding the stored column rewrites the vendors table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 23:41:52.307716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_RANGE_EXPRESSION = (
+    "CASE WHEN lower_range IS NULL AND upper_range IS NULL THEN NULL "
+    "WHEN lower_range > upper_range THEN int4range(upper_range, lower_range, '[]') "
+    "ELSE int4range(lower_range, upper_range, '[]') END"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.add_column(
+        'vendors',
+        sa.Column('price_range', postgresql.INT4RANGE(), sa.Computed(PRICE_RANGE_EXPRESSION, persisted=True), nullable=True)
+    )
+    op.create_index(
+        'ix_vendors_active_category_city_price',
+        'vendors',
+        ['service_category_id', sa.text('lower(city)'), 'price_range'],
+        unique=False,
+        postgresql_using='gist',
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendors_active_category_city_price', table_name='vendors')
+    op.drop_column('vendors', 'price_range')
@@ -0,0 +1,50 @@
+"""vendor discovery indexes
+
+Indexes for faceted vendor discovery (GET /vendors/discover), all partial
+on active vendors:
+- ix_vendors_active_lower_city / ix_vendors_active_lower_district serve the
+  case-insensitive city and district filters.
+- ix_vendors_active_facets covers every column the facet GROUPING SETS
+  pass reads (category, city, district, starting price), so the counts
+  are an index-only scan instead of a heap scan of the catalog.
+
+Built CONCURRENTLY outside the migration transaction, so vendor writes keep
+flowing; if a build fails, drop the INVALID index it leaves before retrying.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 23:58:27.140635
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_vendors_active_lower_city', 'vendors', [sa.text('lower(city)')], unique=False, postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        op.create_index('ix_vendors_active_lower_district', 'vendors', [sa.text('lower(district)')], unique=False, postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        op.create_index(
+            'ix_vendors_active_facets',
+            'vendors',
+            ['service_category_id', 'city', 'district', 'lower_range'],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendors_active_facets', table_name='vendors')
+    op.drop_index('ix_vendors_active_lower_district', table_name='vendors')
+    op.drop_index('ix_vendors_active_lower_city', table_name='vendors')
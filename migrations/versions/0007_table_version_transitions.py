@@ -0,0 +1,164 @@
+"""table version transitions
+
+Table versions only move when a listing could have changed, and the shared
+counter row is only locked at commit:
+- The statement-level triggers now declare transition tables and skip
+  statements that touched no visible row: zero-row statements, no-op
+  updates, and for vendor_media anything that only touches tombstoned
+  rows (the deletion worker's purges) or only delete_attempts.
+- A statement that did change something records (txid, table) in
+  table_version_pending; a deferred constraint trigger on that table does
+  the table_versions upsert at commit, once per table per transaction.
+  Concurrent writers no longer queue on the counter row for the rest of
+  their transaction.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:12:36.480215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigger arguments per table: the tombstone column (rows with it set are
+# invisible to listings), then columns whose changes alone don't count
+VERSIONED_TABLES = {
+    'service_categories': (),
+    'vendors': (),
+    'vendor_media': ('deleted_at', 'delete_attempts'),
+}
+
+# Migration 0003's function, restored on downgrade
+BUMP_ON_STATEMENT = """
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO table_versions (table_name, version, updated_at)
+        VALUES (TG_TABLE_NAME, 1, now())
+        ON CONFLICT (table_name)
+        DO UPDATE SET version = table_versions.version + 1, updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _drop_table_triggers(table: str) -> None:
+    for suffix in ('insert', 'update', 'delete', 'truncate'):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version_{suffix} ON {table}")
+    op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table}")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_version_pending',
+        sa.Column('txid', sa.BigInteger(), server_default=sa.text('txid_current()'), nullable=False),
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.PrimaryKeyConstraint('txid', 'table_name'),
+        prefixes=['UNLOGGED'],
+    )
+
+    # Runs at commit for each table the transaction changed
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version, updated_at)
+            VALUES (NEW.table_name, 1, now())
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = table_versions.version + 1, updated_at = now();
+            DELETE FROM table_version_pending WHERE txid = NEW.txid AND table_name = NEW.table_name;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER table_version_pending_bump AFTER INSERT ON table_version_pending "
+        "DEFERRABLE INITIALLY DEFERRED "
+        "FOR EACH ROW EXECUTE FUNCTION bump_table_version()"
+    )
+
+    # A row is visible while its tombstone column (TG_ARGV[0], if any) is
+    # NULL. Updates pair old and new rows by id and compare them as jsonb
+    # (JSON columns have no equality operator) minus the ignored columns,
+    # stopping at the first pair that differs with either side visible.
+    op.execute(
+        """
+        CREATE FUNCTION mark_table_changed() RETURNS trigger AS $$
+        DECLARE
+            tombstone text := NULLIF(TG_ARGV[0], '');
+            ignored text[] := COALESCE(TG_ARGV[1:TG_NARGS - 1], '{}');
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM 1 FROM new_rows AS n
+                WHERE tombstone IS NULL OR to_jsonb(n) ->> tombstone IS NULL
+                LIMIT 1;
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM 1 FROM old_rows AS o
+                WHERE tombstone IS NULL OR to_jsonb(o) ->> tombstone IS NULL
+                LIMIT 1;
+            ELSIF TG_OP = 'UPDATE' THEN
+                PERFORM 1 FROM old_rows AS o FULL JOIN new_rows AS n ON n.id = o.id
+                WHERE (tombstone IS NULL OR to_jsonb(o) ->> tombstone IS NULL OR to_jsonb(n) ->> tombstone IS NULL)
+                AND to_jsonb(o) - ignored IS DISTINCT FROM to_jsonb(n) - ignored
+                LIMIT 1;
+            END IF;
+            IF TG_OP = 'TRUNCATE' OR FOUND THEN
+                INSERT INTO table_version_pending (table_name) VALUES (TG_TABLE_NAME)
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, args in VERSIONED_TABLES.items():
+        _drop_table_triggers(table)
+        arguments = ", ".join(f"'{arg}'" for arg in args)
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version_insert AFTER INSERT ON {table} "
+            f"REFERENCING NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION mark_table_changed({arguments})"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version_update AFTER UPDATE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION mark_table_changed({arguments})"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version_delete AFTER DELETE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION mark_table_changed({arguments})"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version_truncate AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION mark_table_changed()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        _drop_table_triggers(table)
+    op.execute("DROP FUNCTION IF EXISTS mark_table_changed()")
+    op.drop_table('table_version_pending')
+    op.execute(BUMP_ON_STATEMENT)
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version_truncate "
+            f"AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
@@ -0,0 +1,33 @@
+"""media delete backoff
+
+vendor_media.next_delete_attempt_at holds when the deletion worker may retry
+a tombstone whose S3 delete failed; it is pushed back exponentially with
+each failed attempt. NULL (new tombstones) means due now.
+
+A nullable column without a default is a catalog-only change; the table is
+not rewritten.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 01:05:18.624903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('vendor_media', sa.Column('next_delete_attempt_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('vendor_media', 'next_delete_attempt_at')